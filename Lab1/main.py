@@ -1,8 +1,5 @@
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Border, Side, Alignment
-import matplotlib.pyplot as plt
-from prettytable import PrettyTable
+from common.instrumentation import count, timer
+from common.reporting import open_report
 
 
 class Alternative:
@@ -42,6 +39,22 @@ def compare_by_slater(first: Alternative, second: Alternative):
     return all(comparisons)
 
 
+def mark_dominated(a_list):
+    a_count = len(a_list)
+    with timer("lab1.pareto_slater"):
+        for i in range(a_count):
+            for j in range(a_count):
+                if i == j:
+                    continue
+
+                if not a_list[j].pareto and compare_by_pareto(a_list[i], a_list[j]):
+                    a_list[j].pareto = f"A{i + 1}"
+
+                if not a_list[j].slater and compare_by_slater(a_list[i], a_list[j]):
+                    a_list[j].slater = f"A{i + 1}"
+    count("lab1.pairs_compared", a_count * (a_count - 1))
+
+
 if __name__ == '__main__':
     print("Select input mode:")
     print("1 - Two-digit numbers (e.g., 32, 58, ...)")
@@ -72,17 +85,7 @@ if __name__ == '__main__':
             print("Invalid mode selected.")
             exit(1)
 
-    a_count = len(a_list)
-    for i in range(a_count):
-        for j in range(a_count):
-            if i == j:
-                continue
-
-            if not a_list[j].pareto and compare_by_pareto(a_list[i], a_list[j]):
-                a_list[j].pareto = f"A{i + 1}"
-
-            if not a_list[j].slater and compare_by_slater(a_list[i], a_list[j]):
-                a_list[j].slater = f"A{i + 1}"
+    mark_dominated(a_list)
 
     pareto_groups = {}
     slater_groups = {}
@@ -101,6 +104,8 @@ if __name__ == '__main__':
     pareto_res = ["=".join(group) for group in pareto_groups.values()]
     slater_res = ["=".join(group) for group in slater_groups.values()]
 
+    from prettytable import PrettyTable
+
     table = PrettyTable()
     table.title = "Results"
 
@@ -127,32 +132,16 @@ if __name__ == '__main__':
             FILE_PATH = "multi_criteria_results.xlsx"
 
             try:
-                if mode == '1':
-                    data = {'Q/A': ['Q1', 'Q2', 'Pareto', 'Slater']}
-                    for alt in a_list:
-                        data[alt.name] = [alt.q1, alt.q2, alt.pareto or '-', alt.slater or '-']
-                elif mode == '2':
-                    data = {'Q/A': ['Q1', 'Q2', 'Q3', 'Pareto', 'Slater']}
-                    for alt in a_list:
-                        data[alt.name] = [alt.q1, alt.q2, alt.q3, alt.pareto or '-', alt.slater or '-']
-
-                df = pd.DataFrame(data)
-                df.to_excel(FILE_PATH, index=False)
-
-                wb = load_workbook(FILE_PATH)
-                ws = wb.active
-
-                thin_border = Border(left=Side(style='thin'),
-                                     right=Side(style='thin'),
-                                     top=Side(style='thin'),
-                                     bottom=Side(style='thin'))
-
-                for row in ws.iter_rows():
-                    for cell in row:
-                        cell.border = thin_border
-                        cell.alignment = Alignment(horizontal='center', vertical='center')
-
-                wb.save(FILE_PATH)
+                with open_report(FILE_PATH) as report:
+                    sheet = report.add_sheet("Sheet1")
+                    sheet.append(["Q/A"] + [alt.name for alt in a_list], style="bold")
+                    sheet.append(["Q1"] + [alt.q1 for alt in a_list], style="cell")
+                    sheet.append(["Q2"] + [alt.q2 for alt in a_list], style="cell")
+                    if mode == '2':
+                        sheet.append(["Q3"] + [alt.q3 for alt in a_list], style="cell")
+                    sheet.append(["Pareto"] + [alt.pareto or '-' for alt in a_list], style="cell")
+                    sheet.append(["Slater"] + [alt.slater or '-' for alt in a_list], style="cell")
+
                 print(f"File {FILE_PATH} saved")
             except PermissionError:
                 print(f"ERROR: File {FILE_PATH} is not accessible!\n\tThis file may be open now!")
@@ -167,6 +156,8 @@ if __name__ == '__main__':
         answer = input("> ").lower().strip()
 
         if answer == "y":
+            import matplotlib.pyplot as plt
+
             def setup_subplot(ax, connected_groups, color='r-', title=''):
                 point_coords = {}
 
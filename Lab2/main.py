@@ -1,7 +1,9 @@
-from scipy.optimize import linprog
 from dataclasses import dataclass, field
 from enum import Enum
 
+from common.instrumentation import traced
+from common.reporting import open_report
+
 class OptimizationGoal(Enum):
     MIN = "min"
     MAX = "max"
@@ -107,6 +109,7 @@ def format_num(number) -> str:
     return f"{number:.0f}" if number.is_integer() else f"{number}"
 
 
+@traced("lab2.solve_lp")
 def solve_lp(lp_data: LPData):
     A_ub, b_ub, A_eq, b_eq = [], [], [], []
 
@@ -127,6 +130,8 @@ def solve_lp(lp_data: LPData):
 
     bounds = [(0, None)] * lp_data.x_count
 
+    from scipy.optimize import linprog
+
     result = linprog(c, A_ub=A_ub if A_ub else None, b_ub=b_ub if b_ub else None,
                      A_eq=A_eq if A_eq else None, b_eq=b_eq if b_eq else None,
                      bounds=bounds, method='highs')
@@ -136,8 +141,25 @@ def solve_lp(lp_data: LPData):
             print(f"x{i+1} = {x:.2f}")
         optimal_value = -result.fun if lp_data.optimization_goal == OptimizationGoal.MAX else result.fun
         print(f"Optimal value: {optimal_value:.2f}")
+        return list(result.x), optimal_value
     else:
         print("No solution found.")
+        return None
+
+
+def save_result(solution, file_path="lp_result.xlsx"):
+    x, optimal_value = solution
+    try:
+        with open_report(file_path) as report:
+            sheet = report.add_sheet("Result")
+            sheet.append(["Variable", "Value"], style="bold")
+            for i, value in enumerate(x):
+                sheet.append([f"x{i + 1}", value], style="cell")
+            sheet.append(["F", optimal_value], style="cell")
+    except PermissionError:
+        print(f"ERROR: File {file_path} is not accessible!\n\tThis file may be open now!")
+    else:
+        print(f"File {file_path} saved")
 
 
 if __name__ == '__main__':
@@ -150,7 +172,19 @@ if __name__ == '__main__':
     data_handler.show_data()
 
     print("================= Result =================")
-    solve_lp(data_handler.get())
+    solution = solve_lp(data_handler.get())
+
+    while solution:
+        print("\nSave result to a table? (Y/N)")
+        answer = input("> ").lower().strip()
+
+        if answer == "y":
+            save_result(solution)
+            break
+        elif answer == "n":
+            break
+
+        print("\nWrong input! Try again.")
 
 #1
 # 2 1 <= 40
@@ -1,29 +1,43 @@
-import pandas as pd
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from tabulate import tabulate
+import numpy as np
 import random
 import os
+import sys
+
+from common.instrumentation import Counter, count, traced
+from common.reporting import open_report
 
 
 class InputDataHandler:
     FILE_NAME = "input_data.xlsx"
+    ROW_COUNT = 3
+    BINARY_DTYPE = np.int32
 
     def __init__(self):
         self._table = None
 
     def __str__(self):
-        return tabulate(self._table, tablefmt="fancy_grid") if self._table else "data isn't read"
+        if self._table is None:
+            return "data isn't read"
+        if self._table.size > 100:
+            return f"{self._table.shape[0]}x{self._table.shape[1]} table of {self._table.dtype}"
+        from tabulate import tabulate
+
+        return tabulate(self._table, tablefmt="fancy_grid")
 
     def read_excel(self):
-        print(f"Read data from the file '{self.FILE_NAME}'.....\n")
-        try:
-            df = pd.read_excel(self.FILE_NAME, header=None)
+        self.read(self.FILE_NAME)
 
-            self._verify_data(df)
+    def read(self, file_name):
+        print(f"Read data from the file '{file_name}'.....\n")
+        try:
+            table = self._load(file_name)
 
-            self._table = df.values.tolist()
+            self._table = self._verify_data(table)
         except FileNotFoundError as e:
+            if file_name != self.FILE_NAME:
+                print(f"Failed to read the file:\n\t\tI can't find '{file_name}'.")
+                self._table = None
+                return
             print(f"Failed to read the file:\n\t\tI can't find '{self.FILE_NAME}'.")
             print(f"Thus, I'll create such a file and fill '{self.FILE_NAME}' with random numbers in a 3x20 table.\n")
             self.init_file(2, 90)
@@ -32,16 +46,51 @@ class InputDataHandler:
             print(f"Failed to read the file:\n\t\t{e}")
             self._table = None
 
-    @staticmethod
-    def _verify_data(df):
-        row_lengths = df.apply(lambda row: len(row.dropna()), axis=1).tolist()
-        if len(set(row_lengths)) != 1:
+    def _load(self, file_name):
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in (".xlsx", ".xls"):
+            import pandas as pd
+            return pd.read_excel(file_name, header=None).to_numpy()
+        if extension == ".csv":
+            import pandas as pd
+            return pd.read_csv(file_name, header=None).to_numpy()
+        if extension == ".npy":
+            return np.load(file_name, mmap_mode="r")
+        if extension in (".bin", ".dat"):
+            return np.memmap(file_name, dtype=self.BINARY_DTYPE, mode="r").reshape(self.ROW_COUNT, -1)
+        raise ValueError(f"Unsupported file format '{extension}'")
+
+    @classmethod
+    def _verify_data(cls, table):
+        if table.ndim != 2 or table.size == 0:
+            raise ValueError("The data must be a non-empty 2D table!")
+
+        if table.shape[0] != cls.ROW_COUNT:
+            raise ValueError(f"The table must have {cls.ROW_COUNT} rows, got {table.shape[0]}!")
+
+        if table.dtype.kind in "iu":
+            return table
+
+        if table.dtype.kind == "O":
+            try:
+                table = table.astype(np.float64)
+            except (TypeError, ValueError):
+                raise ValueError("The file has no integer values!")
+
+        if table.dtype.kind != "f":
+            raise ValueError("The file has no integer values!")
+
+        if np.isnan(table).any():
             raise ValueError("Rows have different lengths!")
 
-        if not df.map(lambda x: isinstance(x, int)).all().all():
+        if not np.array_equal(table, np.trunc(table)):
             raise ValueError("The file has no integer values!")
 
+        return table.astype(np.int64)
+
     def init_file(self, min_value, max_value):
+        from openpyxl import Workbook
+
         wb = Workbook()
         ws = wb.active
 
@@ -94,79 +143,53 @@ class OutputDataHandler:
         self.data[index] += row
 
     def save(self):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Аркуш1"
-
-        for row in self.data:
-            ws.append(row)
-
-        # Merging cells
-        ws.merge_cells("A1:A3")
-        ws.merge_cells("B1:E1")
-        ws.merge_cells("F1:I1")
-        ws.merge_cells("B2:E2")
-        ws.merge_cells("F2:I2")
-        ws.merge_cells("A8:A9")
-        ws.merge_cells("B8:E8")
-        ws.merge_cells("F8:I8")
-
-        # Formatting cells
-        bold_font = Font(bold=True)
-        center_align = Alignment(horizontal="center", vertical="center")
-        thin_border = Border(left=Side(style="thin"),
-                             right=Side(style="thin"),
-                             top=Side(style="thin"),
-                             bottom=Side(style="thin"))
-        gray_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-
-        for row in ws.iter_rows(min_row=1, max_row=len(self.data), min_col=1, max_col=9):
-            for cell in row:
-                cell.alignment = center_align
-                cell.border = thin_border
-                if cell.row in [1, 2, 3, 8, 9]:
-                    cell.font = bold_font
-                    cell.fill = gray_fill
-
         try:
-            wb.save(self.FILE_NAME)
+            with open_report(self.FILE_NAME) as report:
+                sheet = report.add_sheet("Аркуш1")
+
+                for row_index, row in enumerate(self.data, start=1):
+                    sheet.append(row, style="header" if row_index in [1, 2, 3, 8, 9] else "cell")
+
+                for cell_range in ["A1:A3", "B1:E1", "F1:I1", "B2:E2", "F2:I2", "A8:A9", "B8:E8", "F8:I8"]:
+                    sheet.merge(cell_range)
         except PermissionError:
             print(f"Failed to open the file '{self.FILE_NAME}'\n\t\tClose this file and rerun.")
         else:
             print(f"Result successfully saved in the file '{self.FILE_NAME}'.")
 
 
+@traced("lab3.quicksort")
 def quicksort_with_counter(arr):
-    cycles = [0]
-
-    def quick_sort_recursive(arr, low, high):
-        cycles[0] += 1
-
-        if low < high:
-            partition_index = partition(arr, low, high)
-
-            quick_sort_recursive(arr, low, partition_index - 1)
-            quick_sort_recursive(arr, partition_index + 1, high)
-
-    def partition(arr, low, high):
-        pivot = arr[high]
-
-        i = low - 1
+    cycles = Counter("lab3.quicksort.cycles")
+    sorted_arr = arr.copy()
 
-        for j in range(low, high):
-            cycles[0] += 1
-            if arr[j] >= pivot:
+    # Iterative three-way partition: no recursion limit, and runs of equal weights are settled in one pass
+    stack = [(0, len(sorted_arr) - 1)]
+    while stack:
+        low, high = stack.pop()
+        cycles.value += 1
+        if low >= high:
+            continue
+
+        pivot = sorted_arr[(low + high) // 2]
+        lt, i, gt = low, low, high
+        while i <= gt:
+            cycles.value += 1
+            if sorted_arr[i] > pivot:
+                sorted_arr[lt], sorted_arr[i] = sorted_arr[i], sorted_arr[lt]
+                lt += 1
+                i += 1
+            elif sorted_arr[i] < pivot:
+                sorted_arr[i], sorted_arr[gt] = sorted_arr[gt], sorted_arr[i]
+                gt -= 1
+            else:
                 i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
-
-    sorted_arr = arr.copy()
 
-    quick_sort_recursive(sorted_arr, 0, len(sorted_arr) - 1)
+        # The smaller part is sorted first, so the stack stays logarithmic
+        parts = sorted([(low, lt - 1), (gt + 1, high)], key=lambda part: part[0] - part[1])
+        stack.extend(parts)
 
-    return sorted_arr, cycles[0]
+    return sorted_arr, cycles.publish()
 
 
 def efficient_sort_with_index(arr):
@@ -195,11 +218,13 @@ def efficient_sort_with_index(arr):
 class NPTable:
     FILE_NAME = "process_table.xlsx"
 
-    def __init__(self):
+    def __init__(self, clear_file=True):
         self.table_data = []
         self.n = 20
         self.is_able_to_open_file = True
-        self.delete_file()
+        self.report = None
+        if clear_file:
+            self.delete_file()
 
     def init(self, n):
         self.n = n
@@ -215,22 +240,23 @@ class NPTable:
         if not self.is_able_to_open_file:
             return
 
-        try:
-            wb = load_workbook(self.FILE_NAME)
-        except FileNotFoundError:
-            wb = Workbook()
-            wb.remove(wb.active)
-
-        ws = wb.create_sheet(title=sheet_name)
+        if self.report is None:
+            self.report = open_report(self.FILE_NAME)
 
+        sheet = self.report.add_sheet(sheet_name)
         for row in self.table_data:
-            ws.append(row)
+            sheet.append(row)
+
+    def close(self):
+        if self.report is None:
+            return
 
         try:
-            wb.save(self.FILE_NAME)
+            self.report.close()
         except PermissionError:
             self.is_able_to_open_file = False
             print(f"Failed to open the file '{self.FILE_NAME}'\n\t\tClose this file and rerun.")
+        self.report = None
 
     def delete_file(self):
         if not self.is_able_to_open_file:
@@ -258,11 +284,12 @@ class NPAlgorithm:
         self.capacity = container_capacity
         self.algorithms = [self.nfa, self.ffa, self.wfa, self.bfa]
         # Variables to saving
-        self.res_table = NPTable()
+        # The process table grows with items x containers, so it is only kept for saving
+        self.res_table = NPTable(clear_file=True) if saving else None
         self.sort = False
         self.row_num = 0
         self.process_count = 0
-        self.saving = True
+        self.saving = saving
 
     def is_save_successful(self):
         if not self.saving:
@@ -270,6 +297,10 @@ class NPAlgorithm:
 
         return self.res_table.is_able_to_open_file
 
+    def close(self):
+        if self.res_table is not None:
+            self.res_table.close()
+
     def get_row_result(self, sort: bool, row_index: int):
         if row_index < 0 or row_index > 2:
             raise ValueError("row_num is from 0 to 2")
@@ -279,9 +310,11 @@ class NPAlgorithm:
 
     def get_table_result(self, sort: bool):
         self.row_num = "1-3"
-        return self._process(sum(self.table, []), sort)
+        return self._process(np.ravel(self.table), sort)
 
     def _process(self, weights: list, sort: bool):
+        # The heuristics step through items one by one, which is much faster on Python ints than on NumPy scalars
+        weights = np.asarray(weights).tolist()
         sort_counter = 0
         if sort:
             self.sort = sort
@@ -291,14 +324,18 @@ class NPAlgorithm:
         for i in range(len(self.algorithms)):
             self.process_count += 1
             containers, counter = self.algorithms[i](weights)
+            count(f"lab3.{self.algorithms[i].__name__}.comparisons", counter)
             result.insert(i, containers)
             result.append(counter + sort_counter)
 
         return result
 
+    @traced("lab3.nfa")
     def nfa(self, weights):
-        self.res_table.init(len(weights))
-        self.res_table.add_new_row()
+        table = self.res_table
+        if table is not None:
+            table.init(len(weights))
+            table.add_new_row()
         container_count = 1
         comparisons = 0
         fullness = 0
@@ -310,18 +347,23 @@ class NPAlgorithm:
             if total <= 100:
                 fullness = total
             else:
-                self.res_table.add_new_row()
+                if table is not None:
+                    table.add_new_row()
                 container_count += 1
                 fullness = weights[i]
-            self.res_table.set(container_count, i + 1, weights[i])
+            if table is not None:
+                table.set(container_count, i + 1, weights[i])
 
-        if self.saving:
-            self.res_table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}NFA.{self.process_count}")
+        if table is not None:
+            table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}NFA.{self.process_count}")
         return container_count, comparisons
 
+    @traced("lab3.ffa")
     def ffa(self, weights):
-        self.res_table.init(len(weights))
-        self.res_table.add_new_row()
+        table = self.res_table
+        if table is not None:
+            table.init(len(weights))
+            table.add_new_row()
         containers = [0]
         comparisons = 0
 
@@ -345,18 +387,23 @@ class NPAlgorithm:
                         break
                     j -= 1
                 if j < 0:
-                    self.res_table.add_new_row()
+                    if table is not None:
+                        table.add_new_row()
                     containers.append(weights[i])
                     container_id = len(containers)
-            self.res_table.set(container_id, i + 1, weights[i])
+            if table is not None:
+                table.set(container_id, i + 1, weights[i])
 
-        if self.saving:
-            self.res_table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}FFA.{self.process_count}")
+        if table is not None:
+            table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}FFA.{self.process_count}")
         return len(containers), comparisons
 
+    @traced("lab3.wfa")
     def wfa(self, weights):
-        self.res_table.init(len(weights))
-        self.res_table.add_new_row()
+        table = self.res_table
+        if table is not None:
+            table.init(len(weights))
+            table.add_new_row()
         containers = [0]
         comparisons = 0
 
@@ -380,18 +427,23 @@ class NPAlgorithm:
                     containers[min_index] = total
                     container_id = min_index + 1
                 else:
-                    self.res_table.add_new_row()
+                    if table is not None:
+                        table.add_new_row()
                     containers.append(weights[i])
                     container_id = len(containers)
-            self.res_table.set(container_id, i + 1, weights[i])
+            if table is not None:
+                table.set(container_id, i + 1, weights[i])
 
-        if self.saving:
-            self.res_table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}WFA.{self.process_count}")
+        if table is not None:
+            table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}WFA.{self.process_count}")
         return len(containers), comparisons
 
+    @traced("lab3.bfa")
     def bfa(self, weights):
-        self.res_table.init(len(weights))
-        self.res_table.add_new_row()
+        table = self.res_table
+        if table is not None:
+            table.init(len(weights))
+            table.add_new_row()
         containers = [0]
         comparisons = 0
 
@@ -418,43 +470,51 @@ class NPAlgorithm:
                         break
                     j -= 1
                 if j < 0:
-                    self.res_table.add_new_row()
+                    if table is not None:
+                        table.add_new_row()
                     containers.append(weights[i])
                     container_id = len(containers)
-            self.res_table.set(container_id, i + 1, weights[i])
+            if table is not None:
+                table.set(container_id, i + 1, weights[i])
 
-        if self.saving:
-            self.res_table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}BFA.{self.process_count}")
+        if table is not None:
+            table.save_new_sheet(f"{self.row_num}.{'s.' if self.sort else ''}BFA.{self.process_count}")
         return len(containers), comparisons
 
     def min_containers_estimate(self, weights):
-        return -(-sum(weights) // self.capacity)
+        return -(-int(np.sum(weights)) // self.capacity)
 
 
 if __name__ == '__main__':
     CAPACITY = 100
 
     input_data_handler = InputDataHandler()
-    input_data_handler.read_excel()
+    if len(sys.argv) > 1:
+        input_data_handler.read(sys.argv[1])
+    else:
+        input_data_handler.read_excel()
     data = input_data_handler.get()
 
-    if data:
+    if data is not None:
         print("Received data successfully:\n", input_data_handler, sep="")
 
         print("\nProcessing.....\n")
-        algorithm_handler = NPAlgorithm(data, CAPACITY)
+        algorithm_handler = NPAlgorithm(data, CAPACITY, saving=True)
         output_data_handler = OutputDataHandler()
 
-        output_data_handler.add_row(False, 1, algorithm_handler.get_row_result(False, 0))
-        output_data_handler.add_row(False, 2, algorithm_handler.get_row_result(False, 1))
-        output_data_handler.add_row(False, 3, algorithm_handler.get_row_result(False, 2))
-        output_data_handler.add_row(False, 4, algorithm_handler.get_table_result(False))
-
-        output_data_handler.add_row(True, 1, algorithm_handler.get_row_result(True, 0))
-        output_data_handler.add_row(True, 2, algorithm_handler.get_row_result(True, 1))
-        output_data_handler.add_row(True, 3, algorithm_handler.get_row_result(True, 2))
-        output_data_handler.add_row(True, 4, algorithm_handler.get_table_result(True))
-
+        # The process table stays open across all runs, so it is finished even if a run fails
+        try:
+            output_data_handler.add_row(False, 1, algorithm_handler.get_row_result(False, 0))
+            output_data_handler.add_row(False, 2, algorithm_handler.get_row_result(False, 1))
+            output_data_handler.add_row(False, 3, algorithm_handler.get_row_result(False, 2))
+            output_data_handler.add_row(False, 4, algorithm_handler.get_table_result(False))
+
+            output_data_handler.add_row(True, 1, algorithm_handler.get_row_result(True, 0))
+            output_data_handler.add_row(True, 2, algorithm_handler.get_row_result(True, 1))
+            output_data_handler.add_row(True, 3, algorithm_handler.get_row_result(True, 2))
+            output_data_handler.add_row(True, 4, algorithm_handler.get_table_result(True))
+        finally:
+            algorithm_handler.close()
         if algorithm_handler.is_save_successful() is not False:
             print("Result saving.....")
             output_data_handler.save()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import sys
+import time
+
+import numpy as np
+
+from .criteria import evaluate_batch
+from .pruning import Candidates
+
+
+def dominated_matrix(strategies_count, states_count, front_count, seed=0):
+    rng = np.random.default_rng(seed)
+    front = rng.random((front_count, states_count)) * 100 + 50
+    matrix = front[rng.integers(0, front_count, strategies_count)] \
+        - rng.random((strategies_count, states_count)) * 50 - 1e-3
+    matrix[rng.choice(strategies_count, front_count, replace=False)] = front
+    return matrix
+
+
+def benchmark(sizes, pessimism_sweep=(0.1, 0.3, 0.5, 0.7, 0.9), seed=0):
+    print(f"{'strategies':>16} {'front':>6} {'kept':>6} {'full, s':>8} {'prune, s':>9} {'eval, ms':>9} "
+          f"{'sweep full, s':>14} {'sweep pruned, s':>16} {'speedup':>8}")
+    for strategies_count, states_count, front_count in sizes:
+        matrix = dominated_matrix(strategies_count, states_count, front_count, seed)
+
+        start = time.perf_counter()
+        full = [evaluate_batch(matrix, pessimism) for pessimism in pessimism_sweep]
+        sweep_full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        candidates = Candidates(matrix)
+        prune_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pruned = [candidates.evaluate(pessimism) for pessimism in pessimism_sweep]
+        sweep_pruned = prune_time + time.perf_counter() - start
+
+        assert all(int(chosen[name][0]) == result[name] for chosen, result in zip(full, pruned) for name in result)
+        start = time.perf_counter()
+        candidates.evaluate(pessimism_sweep[0])
+        eval_time = time.perf_counter() - start
+
+        print(f"{strategies_count:>10}x{states_count:<5} {front_count:>6} {len(candidates.rows):>6} "
+              f"{sweep_full / len(pessimism_sweep):>8.3f} {prune_time:>9.3f} {eval_time * 1e3:>9.2f} "
+              f"{sweep_full:>14.3f} {sweep_pruned:>16.3f} {sweep_full / sweep_pruned:>7.1f}x")
+
+
+if __name__ == '__main__':
+    sizes = [(100000, 8, 5), (1000000, 8, 5), (1000000, 8, 20), (1000000, 16, 10)]
+    if len(sys.argv) > 1:
+        sizes = [tuple(map(int, size.split("x"))) for size in sys.argv[1:]]
+    benchmark(sizes)
@@ -0,0 +1,118 @@
+import numpy as np
+
+from common.instrumentation import count, traced
+
+CRITERIA = ("wald", "savage", "hurwitz", "laplace", "bayes", "hodges_lehmann")
+TIE_MODES = ("first", "last", "all")
+
+
+def as_batch(payoffs):
+    payoffs = np.asarray(payoffs, dtype=np.float64)
+    if payoffs.ndim == 2:
+        payoffs = payoffs[np.newaxis]
+    if payoffs.ndim != 3 or payoffs.shape[1] == 0 or payoffs.shape[2] == 0:
+        raise ValueError("payoffs must have shape (batch, strategies, states)")
+    return payoffs
+
+
+def state_probabilities(probabilities, states_count):
+    if probabilities is None:
+        return np.full(states_count, 1 / states_count)
+
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if probabilities.shape[-1] != states_count:
+        raise ValueError(f"Expected {states_count} state probabilities, got {probabilities.shape[-1]}")
+    if np.any(probabilities < 0) or not np.allclose(probabilities.sum(axis=-1), 1):
+        raise ValueError("State probabilities must be non-negative and sum to 1")
+    return probabilities
+
+
+def wald_values(payoffs):
+    return payoffs.min(axis=2)
+
+
+def savage_values(payoffs):
+    regret = payoffs.max(axis=1, keepdims=True) - payoffs
+    return -regret.max(axis=2)
+
+
+def hurwitz_values(payoffs, pessimism=0.5):
+    return payoffs.min(axis=2) * pessimism + payoffs.max(axis=2) * (1 - pessimism)
+
+
+def laplace_values(payoffs):
+    return payoffs.mean(axis=2)
+
+
+def bayes_values(payoffs, probabilities=None):
+    probabilities = state_probabilities(probabilities, payoffs.shape[2])
+    if probabilities.ndim == 1:
+        return payoffs @ probabilities
+    return np.einsum("bms,bs->bm", payoffs, probabilities)
+
+
+def hodges_lehmann_values(payoffs, probabilities=None, confidence=0.5):
+    return confidence * bayes_values(payoffs, probabilities) + (1 - confidence) * wald_values(payoffs)
+
+
+def choose(values, ties="first", atol=1e-9):
+    if ties not in TIE_MODES:
+        raise ValueError(f"ties must be one of {TIE_MODES}")
+
+    is_best = values >= values.max(axis=1, keepdims=True) - atol
+    if ties == "all":
+        return is_best
+    if ties == "first":
+        return is_best.argmax(axis=1) + 1
+    return values.shape[1] - is_best[:, ::-1].argmax(axis=1)
+
+
+@traced("lab6.evaluate_batch")
+def evaluate_batch(payoffs, pessimism=0.5, probabilities=None, confidence=0.5, ties="first", atol=1e-9):
+    payoffs = as_batch(payoffs)
+    count("lab6.matrices_evaluated", payoffs.shape[0])
+
+    values = {
+        "wald": wald_values(payoffs),
+        "savage": savage_values(payoffs),
+        "hurwitz": hurwitz_values(payoffs, pessimism),
+        "laplace": laplace_values(payoffs),
+        "bayes": bayes_values(payoffs, probabilities),
+        "hodges_lehmann": hodges_lehmann_values(payoffs, probabilities, confidence),
+    }
+
+    return {name: choose(values[name], ties, atol) for name in CRITERIA}
+
+
+@traced("lab6.hurwitz_sweep")
+def hurwitz_sweep(matrix):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    intercepts = matrix.max(axis=1)
+    slopes = matrix.min(axis=1) - intercepts
+
+    hull = []
+    for i in np.lexsort((np.arange(len(slopes)), -intercepts, slopes)):
+        if hull and slopes[hull[-1]] == slopes[i]:
+            continue
+        while len(hull) >= 2 and _intersection(hull[-2], i, slopes, intercepts) <= \
+                _intersection(hull[-2], hull[-1], slopes, intercepts):
+            hull.pop()
+        hull.append(i)
+
+    breakpoints = [0.0]
+    strategies = []
+    for position, i in enumerate(hull):
+        end = _intersection(i, hull[position + 1], slopes, intercepts) if position + 1 < len(hull) else 1.0
+        end = min(end, 1.0)
+        if end <= breakpoints[-1]:
+            continue
+        strategies.append(int(i) + 1)
+        breakpoints.append(end)
+        if end == 1.0:
+            break
+
+    return np.array(breakpoints), np.array(strategies)
+
+
+def _intersection(first, second, slopes, intercepts):
+    return (intercepts[first] - intercepts[second]) / (slopes[second] - slopes[first])
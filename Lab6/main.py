@@ -1,3 +1,6 @@
+from common.instrumentation import traced
+
+
 def transpose(matrix):
     transposed_matrix = []
 
@@ -13,12 +16,14 @@ def transpose(matrix):
     return transposed_matrix
 
 
+@traced("lab6.wald")
 def wald_criterion(matrix):
     minimal_winning = [min(strategy) for strategy in matrix]
 
     return minimal_winning.index(max(minimal_winning)) + 1
 
 
+@traced("lab6.savage")
 def savage_criterion(matrix):
     transpose_matrix = transpose(matrix)
 
@@ -28,7 +33,7 @@ def savage_criterion(matrix):
 
     for i in range(len(risk_matrix)):
 
-        for j in range(len(risk_matrix)):
+        for j in range(len(risk_matrix[i])):
             risk_matrix[i][j] = maximum_winning[j] - risk_matrix[i][j]
 
     maximum_risking = [max(strategy) for strategy in risk_matrix]
@@ -36,6 +41,7 @@ def savage_criterion(matrix):
     return maximum_risking.index(min(maximum_risking)) + 1
 
 
+@traced("lab6.hurwitz")
 def hurwitz_criterion(matrix, pessimism=0.5):
     minimal_winning = [min(strategy) for strategy in matrix]
 
@@ -55,8 +61,46 @@ winning_matrix = [
     [6, 13, 36, 84, 15, 85]
 ]
 
-print("Wald optimal strategy:", wald_criterion(winning_matrix))
-
-print("Savage optimal strategy:", savage_criterion(winning_matrix))
-
-print("Hurwitz optimal strategy:", hurwitz_criterion(winning_matrix, 0.9))
+if __name__ == '__main__':
+    results = [
+        ("Wald", wald_criterion(winning_matrix)),
+        ("Savage", savage_criterion(winning_matrix)),
+        ("Hurwitz", hurwitz_criterion(winning_matrix, 0.9)),
+    ]
+    for name, strategy in results:
+        print(f"{name} optimal strategy:", strategy)
+
+    from .criteria import hurwitz_sweep
+
+    breakpoints, strategies = hurwitz_sweep(winning_matrix)
+    for i, strategy in enumerate(strategies):
+        print(f"Hurwitz optimal strategy for pessimism in [{breakpoints[i]:.4f}, {breakpoints[i + 1]:.4f}]:", strategy)
+
+    while True:
+        print("\nSave results to a table? (Y/N)")
+        answer = input("> ").lower().strip()
+
+        if answer == "y":
+            from common.reporting import open_report
+
+            file_path = "nature_game_results.xlsx"
+            try:
+                with open_report(file_path) as report:
+                    sheet = report.add_sheet("Criteria")
+                    sheet.append(["Criterion", "Optimal strategy"], style="bold")
+                    for name, strategy in results:
+                        sheet.append([name, strategy], style="cell")
+
+                    sheet = report.add_sheet("Hurwitz sweep")
+                    sheet.append(["Pessimism from", "Pessimism to", "Optimal strategy"], style="bold")
+                    for i, strategy in enumerate(strategies):
+                        sheet.append([breakpoints[i], breakpoints[i + 1], int(strategy)], style="cell")
+
+                print(f"File {file_path} saved")
+            except PermissionError:
+                print(f"ERROR: File {file_path} is not accessible!\n\tThis file may be open now!")
+            break
+        elif answer == "n":
+            break
+
+        print("\nWrong input! Try again.")
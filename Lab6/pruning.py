@@ -0,0 +1,200 @@
+import numpy as np
+
+from common.instrumentation import count, traced
+from .criteria import CRITERIA, TIE_MODES, state_probabilities
+
+WORK_BUDGET = 32
+FILTER_ROWS = 16
+BLOCK_ROWS = 1 << 15
+
+
+def _front(matrix, sums, work_budget=None):
+    rows_count, states_count = matrix.shape
+    index = np.arange(rows_count)
+    columns = np.ascontiguousarray(matrix.T)
+    # Sums of the undecided rows; kept and pruned rows are set to -inf
+    live = sums.copy()
+    dominator = np.full(rows_count, -1)
+    kept = []
+    budget = np.inf if work_budget is None else work_budget * rows_count
+
+    while len(live):
+        # The undecided row with the largest sum is never dominated: a dominator has a strictly larger sum
+        top = int(live.argmax())
+        if live[top] == -np.inf:
+            break
+        if budget < len(live):
+            # Stop early on flat fronts: the undecided rows simply stay candidates
+            kept.extend(index[live > -np.inf].tolist())
+            break
+        budget -= len(live)
+
+        kept.append(index[top])
+        live[top] = -np.inf
+        # Equal rows have equal sums, so a smaller sum rules out duplicates and makes the dominance strict
+        dominated = (live < sums[top]) & (live > -np.inf)
+        below = np.empty_like(dominated)
+        for j in range(states_count):
+            np.less_equal(columns[j], columns[j, top], out=below)
+            dominated &= below
+        candidates = np.flatnonzero(dominated)
+        dominator[index[candidates]] = index[top]
+        live[candidates] = -np.inf
+
+        alive = live > -np.inf
+        if np.count_nonzero(alive) * 2 < len(live):
+            index, columns, sums, live = index[alive], columns[:, alive], sums[alive], live[alive]
+
+    return np.array(kept, dtype=int), dominator
+
+
+def _filter(matrix, sums, filter_rows, filter_sums):
+    dominator = np.full(len(matrix), -1)
+    for start in range(0, len(matrix), BLOCK_ROWS):
+        # Small blocks are transposed in cache, so every comparison runs over a contiguous column
+        columns = matrix[start:start + BLOCK_ROWS].T.copy()
+        block_sums = sums[start:start + BLOCK_ROWS]
+        found = dominator[start:start + BLOCK_ROWS]
+        below = np.empty(len(block_sums), dtype=bool)
+        for k, row in enumerate(filter_rows):
+            dominated = (block_sums < filter_sums[k]) & (found < 0)
+            for j, value in enumerate(row):
+                np.less_equal(columns[j], value, out=below)
+                dominated &= below
+            found[dominated] = k
+    return dominator
+
+
+@traced("lab6.skyline")
+def skyline(matrix, work_budget=WORK_BUDGET):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    strategies_count = len(matrix)
+    sums = matrix.sum(axis=1)
+    dominator = np.full(strategies_count, -1)
+
+    # Rows with the largest sums can only be dominated by each other, so their front is a part of the skyline.
+    # A few of its rows prune most of a heavily dominated matrix in one blocked pass.
+    top = np.argsort(-sums, kind="stable")[:4 * FILTER_ROWS] if strategies_count <= 4 * FILTER_ROWS else \
+        np.argpartition(-sums, 4 * FILTER_ROWS)[:4 * FILTER_ROWS]
+    top_kept, top_dominator = _front(matrix[top], sums[top])
+    dominator[top] = np.where(top_dominator >= 0, top[top_dominator], -1)
+    filters = top[top_kept[np.argsort(-sums[top[top_kept]], kind="stable")][:FILTER_ROWS]]
+
+    rest = np.ones(strategies_count, dtype=bool)
+    rest[top] = False
+    rest = np.flatnonzero(rest)
+    found = _filter(matrix[rest], sums[rest], matrix[filters], sums[filters])
+    dominator[rest[found >= 0]] = filters[found[found >= 0]]
+
+    survivors = rest[found < 0]
+    survivors_kept, survivors_dominator = _front(matrix[survivors], sums[survivors], work_budget)
+    pruned = survivors_dominator >= 0
+    dominator[survivors[pruned]] = survivors[survivors_dominator[pruned]]
+
+    return np.sort(np.concatenate([top[top_kept], survivors[survivors_kept]])), dominator
+
+
+class Candidates:
+    def __init__(self, matrix, work_budget=WORK_BUDGET):
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        if self.matrix.ndim != 2 or self.matrix.size == 0:
+            raise ValueError("The payoff matrix must be a non-empty 2D table")
+
+        self.rows, self.dominator = skyline(self.matrix, work_budget)
+        self.reduced = self.matrix[self.rows]
+        # Column maxima are always reached on non-dominated rows, so Savage regrets stay exact
+        self.column_max = self.reduced.max(axis=0)
+        self.pruned = np.flatnonzero(self.dominator >= 0)
+        self.pruned_dominator = self.dominator[self.pruned]
+        self.followers = {}
+        count("lab6.dominated_strategies", len(self.pruned))
+
+    def values(self, name, payoffs, pessimism=0.5, probabilities=None, confidence=0.5):
+        if name == "wald":
+            return payoffs.min(axis=1)
+        if name == "savage":
+            return -(self.column_max - payoffs).max(axis=1)
+        if name == "hurwitz":
+            return payoffs.min(axis=1) * pessimism + payoffs.max(axis=1) * (1 - pessimism)
+        if name == "laplace":
+            return payoffs.mean(axis=1)
+        if name == "bayes":
+            return payoffs @ probabilities
+        return confidence * (payoffs @ probabilities) + (1 - confidence) * payoffs.min(axis=1)
+
+    def dominated_by(self, winners):
+        # The same optimal rows usually win several criteria, so their dominated rows are gathered once
+        key = winners.tobytes()
+        if key not in self.followers:
+            rows = self.pruned[np.isin(self.pruned_dominator, winners)]
+            payoffs = self.matrix[rows]
+            self.followers[key] = {
+                "rows": rows, "payoffs": payoffs, "winner": np.searchsorted(winners, self.dominator[rows]),
+                "min": payoffs.min(axis=1), "max": payoffs.max(axis=1), "sum": payoffs.sum(axis=1),
+            }
+        return self.followers[key]
+
+    def upper_bounds(self, name, followers, winners, pessimism, probabilities, confidence):
+        # Cheap bounds from row statistics and from the dominating row; only rows reaching the optimum are rechecked
+        if name == "wald":
+            return followers["min"]
+        if name == "hurwitz":
+            return followers["min"] * pessimism + followers["max"] * (1 - pessimism)
+        if name == "laplace":
+            return followers["sum"] / self.matrix.shape[1]
+        winner = followers["winner"]
+        if name == "savage":
+            regret_column = (self.matrix[winners] - self.column_max).argmin(axis=1)[winner]
+            return followers["payoffs"][np.arange(len(winner)), regret_column] - self.column_max[regret_column]
+        # Every state has at least the smallest probability, so each unit of the sum gap costs at least that much
+        winner_bayes = self.matrix[winners] @ probabilities
+        winner_sums = self.matrix[winners].sum(axis=1)
+        bayes = np.minimum(followers["max"], winner_bayes[winner] - probabilities.min() * (winner_sums[winner] - followers["sum"]))
+        if name == "bayes":
+            return bayes
+        return confidence * bayes + (1 - confidence) * followers["min"]
+
+    @traced("lab6.pruned_evaluate")
+    def evaluate(self, pessimism=0.5, probabilities=None, confidence=0.5, ties="first", atol=1e-9):
+        if ties not in TIE_MODES:
+            raise ValueError(f"ties must be one of {TIE_MODES}")
+        # Pruning is only sound for criteria that never prefer a dominated strategy
+        if not 0 <= pessimism <= 1 or not 0 <= confidence <= 1:
+            raise ValueError("pessimism and confidence must lie in [0, 1]")
+        probabilities = state_probabilities(probabilities, self.matrix.shape[1])
+        if probabilities.ndim != 1:
+            raise ValueError("Expected one probability vector for a single payoff matrix")
+
+        strategies_count = len(self.matrix)
+        result = {}
+        for name in CRITERIA:
+            values = self.values(name, self.reduced, pessimism, probabilities, confidence)
+            threshold = values.max() - atol
+            winners = self.rows[values >= threshold]
+
+            # A dominated strategy can only tie with the optimum if its dominator is optimal too
+            followers = self.dominated_by(winners)
+            if len(followers["rows"]):
+                bounds = self.upper_bounds(name, followers, winners, pessimism, probabilities, confidence)
+                close = np.flatnonzero(bounds >= threshold - 1e-9 * max(1.0, abs(threshold)))
+                if ties == "first":
+                    close = close[followers["rows"][close] < winners[0]]
+                elif ties == "last":
+                    close = close[followers["rows"][close] > winners[-1]]
+                if len(close):
+                    tied_values = self.values(name, followers["payoffs"][close], pessimism, probabilities, confidence)
+                    winners = np.union1d(winners, followers["rows"][close[tied_values >= threshold]])
+
+            if ties == "all":
+                is_best = np.zeros(strategies_count, dtype=bool)
+                is_best[winners] = True
+                result[name] = is_best
+            elif ties == "first":
+                result[name] = int(winners[0]) + 1
+            else:
+                result[name] = int(winners[-1]) + 1
+        return result
+
+
+def pruned_evaluate(matrix, pessimism=0.5, probabilities=None, confidence=0.5, ties="first", atol=1e-9):
+    return Candidates(matrix).evaluate(pessimism, probabilities, confidence, ties, atol)
@@ -0,0 +1,61 @@
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from .criteria import CRITERIA, as_batch, evaluate_batch
+
+METHODS = ("normal", "uniform", "bootstrap")
+
+
+def sample_payoffs(matrix, size, rng, method="normal", noise=1.0):
+    if method == "normal":
+        return matrix + rng.normal(0.0, 1.0, (size, *matrix.shape)) * noise
+    if method == "uniform":
+        return matrix + rng.uniform(-1.0, 1.0, (size, *matrix.shape)) * noise
+    if method == "bootstrap":
+        states = rng.integers(0, matrix.shape[1], (size, matrix.shape[1]))
+        return matrix[:, states].transpose(1, 0, 2)
+    raise ValueError(f"method must be one of {METHODS}")
+
+
+def _count_wins(matrix, size, seed, method, noise, options):
+    rng = np.random.default_rng(seed)
+    choices = evaluate_batch(sample_payoffs(matrix, size, rng, method, noise), **options)
+    if options.get("ties") == "all":
+        # Every tied optimal strategy wins the sample, so frequencies may add up to more than one
+        return {name: choices[name].sum(axis=0) for name in CRITERIA}
+    return {name: np.bincount(choices[name] - 1, minlength=matrix.shape[0]) for name in CRITERIA}
+
+
+def wilson_interval(wins, samples, confidence=0.95):
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    frequency = wins / samples
+    center = (frequency + z ** 2 / (2 * samples)) / (1 + z ** 2 / samples)
+    margin = z / (1 + z ** 2 / samples) * np.sqrt(frequency * (1 - frequency) / samples + z ** 2 / (4 * samples ** 2))
+    return center - margin, center + margin
+
+
+def robustness(matrix, samples=10000, method="normal", noise=1.0, seed=None, batch_size=1000, workers=1,
+               confidence=0.95, **options):
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    matrix = as_batch(matrix)[0]
+    noise = np.asarray(noise, dtype=np.float64)
+
+    sizes = [min(batch_size, samples - start) for start in range(0, samples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(matrix, size, task_seed, method, noise, options) for size, task_seed in zip(sizes, seeds)]
+
+    if workers <= 1:
+        results = [_count_wins(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_count_wins, *zip(*tasks)))
+
+    report = {}
+    for name in CRITERIA:
+        wins = np.sum([result[name] for result in results], axis=0)
+        lower, upper = wilson_interval(wins, samples, confidence)
+        report[name] = {"wins": wins, "frequency": wins / samples, "lower": lower, "upper": upper}
+    return report
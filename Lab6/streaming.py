@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from common.instrumentation import traced
+from .criteria import choose
+
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def open_payoffs(file_name, states_count=None, dtype=np.float64):
+    if os.path.splitext(file_name)[1].lower() == ".npy":
+        return np.load(file_name, mmap_mode="r")
+    if states_count is None:
+        raise ValueError("states_count is required for raw binary payoff files")
+    return np.memmap(file_name, dtype=dtype, mode="r").reshape(-1, states_count)
+
+
+def chunk_bounds(rows_count, states_count, chunk_rows=None):
+    if chunk_rows is None:
+        chunk_rows = max(1, CHUNK_BYTES // (states_count * 8))
+    return [(start, min(start + chunk_rows, rows_count)) for start in range(0, rows_count, chunk_rows)]
+
+
+def _map_chunks(function, bounds, workers):
+    if workers <= 1:
+        return [function(start, stop) for start, stop in bounds]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda bound: function(*bound), bounds))
+
+
+def row_statistics(matrix, chunk_rows=None, workers=1):
+    strategies_count, states_count = matrix.shape
+    bounds = chunk_bounds(strategies_count, states_count, chunk_rows)
+
+    def scan(start, stop):
+        chunk = np.asarray(matrix[start:stop], dtype=np.float64)
+        return chunk.min(axis=1), chunk.max(axis=1), chunk.mean(axis=1), chunk.max(axis=0)
+
+    results = _map_chunks(scan, bounds, workers)
+    return {
+        "min": np.concatenate([result[0] for result in results]),
+        "max": np.concatenate([result[1] for result in results]),
+        "mean": np.concatenate([result[2] for result in results]),
+        "column_max": np.maximum.reduce([result[3] for result in results]),
+    }
+
+
+def maximum_regret(matrix, column_max, chunk_rows=None, workers=1):
+    strategies_count, states_count = matrix.shape
+    bounds = chunk_bounds(strategies_count, states_count, chunk_rows)
+
+    def scan(start, stop):
+        chunk = np.asarray(matrix[start:stop], dtype=np.float64)
+        return (column_max - chunk).max(axis=1)
+
+    return np.concatenate(_map_chunks(scan, bounds, workers))
+
+
+@traced("lab6.stream_evaluate")
+def stream_evaluate(matrix, pessimism=0.5, chunk_rows=None, workers=1, savage=True):
+    statistics = row_statistics(matrix, chunk_rows, workers)
+
+    values = {
+        "wald": statistics["min"],
+        "hurwitz": statistics["min"] * pessimism + statistics["max"] * (1 - pessimism),
+        "laplace": statistics["mean"],
+    }
+    if savage:
+        values["savage"] = -maximum_regret(matrix, statistics["column_max"], chunk_rows, workers)
+
+    return {name: int(choose(value[np.newaxis])[0]) for name, value in values.items()}
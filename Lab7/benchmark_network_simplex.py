@@ -0,0 +1,75 @@
+import sys
+import time
+
+import numpy as np
+
+from .network_simplex import network_simplex, arcs_cost
+
+
+def random_instance(suppliers_count, consumers_count, routes_per_supplier, seed=0, fractional=False):
+    rng = np.random.default_rng(seed)
+
+    routes = {(i, int(j)) for i in range(suppliers_count)
+              for j in rng.choice(consumers_count, routes_per_supplier, replace=False)}
+    covered = {j for _, j in routes}
+    routes |= {(int(rng.integers(suppliers_count)), j) for j in range(consumers_count) if j not in covered}
+    routes = sorted(routes)
+
+    capacities = rng.integers(10, 60, len(routes))
+    flows = rng.integers(0, capacities + 1)
+    supply = np.zeros(suppliers_count, dtype=int)
+    demand = np.zeros(consumers_count, dtype=int)
+    for (i, j), flow in zip(routes, flows):
+        supply[i] += flow
+        demand[j] += flow
+    supply += rng.integers(0, 5, suppliers_count)
+
+    arcs = [(i, j, int(cost), int(capacity))
+            for (i, j), cost, capacity in zip(routes, rng.integers(1, 100, len(routes)), capacities)]
+    if fractional:
+        # Amounts with one decimal place do not add up exactly in floating point
+        arcs = [(i, j, cost, capacity / 10) for i, j, cost, capacity in arcs]
+        return (supply / 10).tolist(), (demand / 10).tolist(), arcs
+    return supply.tolist(), demand.tolist(), arcs
+
+
+def solve_linprog(supply, demand, arcs):
+    from scipy import sparse
+    from scipy.optimize import linprog
+
+    arcs_count = len(arcs)
+    columns = np.arange(arcs_count)
+    sources = sparse.csr_matrix((np.ones(arcs_count), ([arc[0] for arc in arcs], columns)),
+                                shape=(len(supply), arcs_count))
+    targets = sparse.csr_matrix((np.ones(arcs_count), ([arc[1] for arc in arcs], columns)),
+                                shape=(len(demand), arcs_count))
+    return linprog([arc[2] for arc in arcs], A_ub=sources, b_ub=supply, A_eq=targets, b_eq=demand,
+                   bounds=[(0, arc[3]) for arc in arcs], method="highs")
+
+
+def benchmark(sizes, routes_per_supplier=5, seed=0):
+    print(f"{'nodes':>12} {'amounts':>10} {'arcs':>8} {'simplex, s':>11} {'pivots':>8} {'linprog, s':>11} "
+          f"{'cost diff':>10}")
+    for suppliers_count, consumers_count in sizes:
+        for fractional in (False, True):
+            supply, demand, arcs = random_instance(suppliers_count, consumers_count, routes_per_supplier, seed,
+                                                   fractional)
+
+            start = time.perf_counter()
+            flows, pivots = network_simplex(supply, demand, arcs)
+            simplex_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = solve_linprog(supply, demand, arcs)
+            linprog_time = time.perf_counter() - start
+
+            amounts = "fractional" if fractional else "integer"
+            print(f"{suppliers_count:>5}x{consumers_count:<6} {amounts:>10} {len(arcs):>8} {simplex_time:>11.3f} "
+                  f"{pivots:>8} {linprog_time:>11.3f} {arcs_cost(flows, arcs) - result.fun:>10.2g}")
+
+
+if __name__ == '__main__':
+    sizes = [(100, 100), (300, 300), (1000, 1000)]
+    if len(sys.argv) > 1:
+        sizes = [tuple(map(int, size.split("x"))) for size in sys.argv[1:]]
+    benchmark(sizes)
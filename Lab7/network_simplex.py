@@ -0,0 +1,265 @@
+import math
+
+import numpy as np
+
+from .potentials import TOLERANCE
+
+
+def dense_arcs(cost_matrix):
+    return [(i, j, cost) for i, row in enumerate(cost_matrix) for j, cost in enumerate(row)]
+
+
+def balance_arcs(supply, demand, arcs):
+    supply = list(supply)
+    demand = list(demand)
+    arcs = [tuple(arc) if len(arc) == 4 else (*arc, math.inf) for arc in arcs]
+
+    total_supply = sum(supply)
+    total_demand = sum(demand)
+
+    # Float sums of fractional amounts rarely match exactly; a rounding residue stays on the artificial arcs
+    if total_supply - total_demand > TOLERANCE:
+        demand.append(total_supply - total_demand)
+        arcs += [(i, len(demand) - 1, 0, math.inf) for i in range(len(supply))]
+    elif total_demand - total_supply > TOLERANCE:
+        supply.append(total_demand - total_supply)
+        arcs += [(len(supply) - 1, j, 0, math.inf) for j in range(len(demand))]
+
+    return supply, demand, arcs
+
+
+class NetworkSimplex:
+    def __init__(self, supply, demand, arcs):
+        suppliers_count = len(supply)
+        self.nodes_count = suppliers_count + len(demand)
+        self.root = self.nodes_count
+        balances = list(supply) + [-amount for amount in demand]
+
+        self.source = [i for i, _, _, _ in arcs]
+        self.target = [suppliers_count + j for _, j, _, _ in arcs]
+        self.cost = [cost for _, _, cost, _ in arcs]
+        self.capacity = [capacity for _, _, _, capacity in arcs]
+        self.flow = [0] * len(arcs)
+        self.arcs_count = len(arcs)
+
+        finite = [capacity for capacity in self.capacity if capacity < math.inf]
+        big_cost = 3 * max(sum(abs(cost) for cost in self.cost), sum(finite), sum(map(abs, balances)), 1)
+
+        # Artificial arcs to the root form a strongly feasible initial tree
+        for node, balance in enumerate(balances):
+            if balance >= 0:
+                self.source.append(node)
+                self.target.append(self.root)
+            else:
+                self.source.append(self.root)
+                self.target.append(node)
+            self.cost.append(big_cost)
+            self.capacity.append(math.inf)
+            self.flow.append(abs(balance))
+
+        n = self.nodes_count
+        self.potential = [big_cost if balance >= 0 else -big_cost for balance in balances] + [0]
+        self.parent = [self.root] * n + [-1]
+        self.edge = list(range(self.arcs_count, self.arcs_count + n)) + [-1]
+        self.size = [1] * n + [n + 1]
+        self.next = list(range(1, n + 1)) + [0]
+        self.prev = [self.root] + list(range(n))
+        self.last = list(range(n)) + [n - 1]
+
+    def reduced_cost(self, i):
+        cost = self.cost[i] - self.potential[self.source[i]] + self.potential[self.target[i]]
+        return -cost if self.flow[i] > TOLERANCE else cost
+
+    def entering_arcs(self):
+        arcs_count = self.arcs_count
+        if arcs_count == 0:
+            return
+        block = math.ceil(math.sqrt(arcs_count))
+        blocks_count = (arcs_count + block - 1) // block
+        start = 0
+        unproductive = 0
+        while unproductive < blocks_count:
+            stop = start + block
+            if stop <= arcs_count:
+                candidates = range(start, stop)
+                start = stop % arcs_count
+            else:
+                start = stop - arcs_count
+                candidates = list(range(stop - block, arcs_count)) + list(range(start))
+            i = min(candidates, key=self.reduced_cost)
+            if self.reduced_cost(i) >= -TOLERANCE:
+                unproductive += 1
+                continue
+            unproductive = 0
+            if self.flow[i] <= TOLERANCE:
+                yield i, self.source[i], self.target[i]
+            else:
+                yield i, self.target[i], self.source[i]
+
+    def find_apex(self, p, q):
+        size_p, size_q = self.size[p], self.size[q]
+        while True:
+            while size_p < size_q:
+                p = self.parent[p]
+                size_p = self.size[p]
+            while size_p > size_q:
+                q = self.parent[q]
+                size_q = self.size[q]
+            if size_p == size_q:
+                if p == q:
+                    return p
+                p, q = self.parent[p], self.parent[q]
+                size_p, size_q = self.size[p], self.size[q]
+
+    def trace_path(self, p, apex):
+        nodes, edges = [p], []
+        while p != apex:
+            edges.append(self.edge[p])
+            p = self.parent[p]
+            nodes.append(p)
+        return nodes, edges
+
+    def find_cycle(self, i, p, q):
+        apex = self.find_apex(p, q)
+        nodes, edges = self.trace_path(p, apex)
+        nodes.reverse()
+        edges.reverse()
+        if edges != [i]:
+            edges.append(i)
+        back_nodes, back_edges = self.trace_path(q, apex)
+        return nodes + back_nodes[:-1], edges + back_edges
+
+    def residual_capacity(self, i, p):
+        return self.capacity[i] - self.flow[i] if self.source[i] == p else self.flow[i]
+
+    def find_leaving_arc(self, nodes, edges):
+        # The last blocking arc along the cycle keeps the tree strongly feasible
+        j, s = min(zip(reversed(edges), reversed(nodes)), key=lambda arc: self.residual_capacity(*arc))
+        t = self.target[j] if self.source[j] == s else self.source[j]
+        return j, s, t
+
+    def augment_flow(self, nodes, edges, amount):
+        for i, p in zip(edges, nodes):
+            if self.source[i] == p:
+                self.flow[i] += amount
+            else:
+                self.flow[i] -= amount
+
+    def subtree(self, p):
+        yield p
+        last = self.last[p]
+        while p != last:
+            p = self.next[p]
+            yield p
+
+    def remove_edge(self, s, t):
+        size_t = self.size[t]
+        prev_t = self.prev[t]
+        last_t = self.last[t]
+        next_last_t = self.next[last_t]
+        self.parent[t] = -1
+        self.edge[t] = -1
+        self.next[prev_t] = next_last_t
+        self.prev[next_last_t] = prev_t
+        self.next[last_t] = t
+        self.prev[t] = last_t
+        while s != -1:
+            self.size[s] -= size_t
+            if self.last[s] == last_t:
+                self.last[s] = prev_t
+            s = self.parent[s]
+
+    def make_root(self, q):
+        ancestors = []
+        while q != -1:
+            ancestors.append(q)
+            q = self.parent[q]
+        ancestors.reverse()
+        for p, q in zip(ancestors, ancestors[1:]):
+            size_p = self.size[p]
+            last_p = self.last[p]
+            prev_q = self.prev[q]
+            last_q = self.last[q]
+            next_last_q = self.next[last_q]
+            self.parent[p] = q
+            self.parent[q] = -1
+            self.edge[p] = self.edge[q]
+            self.edge[q] = -1
+            self.size[p] = size_p - self.size[q]
+            self.size[q] = size_p
+            self.next[prev_q] = next_last_q
+            self.prev[next_last_q] = prev_q
+            self.next[last_q] = q
+            self.prev[q] = last_q
+            if last_p == last_q:
+                self.last[p] = prev_q
+                last_p = prev_q
+            self.prev[p] = last_q
+            self.next[last_q] = p
+            self.next[last_p] = q
+            self.prev[q] = last_p
+            self.last[q] = last_p
+
+    def add_edge(self, i, p, q):
+        last_p = self.last[p]
+        next_last_p = self.next[last_p]
+        size_q = self.size[q]
+        last_q = self.last[q]
+        self.parent[q] = p
+        self.edge[q] = i
+        self.next[last_p] = q
+        self.prev[q] = last_p
+        self.prev[next_last_p] = last_q
+        self.next[last_q] = next_last_p
+        while p != -1:
+            self.size[p] += size_q
+            if self.last[p] == last_p:
+                self.last[p] = last_q
+            p = self.parent[p]
+
+    def update_potentials(self, i, p, q):
+        if q == self.target[i]:
+            delta = self.potential[p] - self.cost[i] - self.potential[q]
+        else:
+            delta = self.potential[p] + self.cost[i] - self.potential[q]
+        for node in self.subtree(q):
+            self.potential[node] += delta
+
+    def solve(self):
+        pivots = 0
+        for i, p, q in self.entering_arcs():
+            pivots += 1
+            nodes, edges = self.find_cycle(i, p, q)
+            j, s, t = self.find_leaving_arc(nodes, edges)
+            self.augment_flow(nodes, edges, self.residual_capacity(j, s))
+            if i == j:
+                continue
+            if self.parent[t] != s:
+                s, t = t, s
+            if edges.index(i) > edges.index(j):
+                p, q = q, p
+            self.remove_edge(s, t)
+            self.make_root(q)
+            self.add_edge(i, p, q)
+            self.update_potentials(i, p, q)
+
+        if any(flow > TOLERANCE for flow in self.flow[self.arcs_count:]):
+            raise ValueError("The transport problem is infeasible on the given routes")
+        return pivots
+
+
+def network_simplex(supply, demand, arcs):
+    arcs_count = len(arcs)
+    supply, demand, arcs = balance_arcs(supply, demand, arcs)
+    # Zero-capacity routes can never carry flow and would stall the pivoting
+    usable = [k for k, arc in enumerate(arcs) if arc[3] > 0]
+    solver = NetworkSimplex(supply, demand, [arcs[k] for k in usable])
+    pivots = solver.solve()
+
+    flows = np.zeros(len(arcs))
+    flows[usable] = solver.flow[:len(usable)]
+    return flows[:arcs_count], pivots
+
+
+def arcs_cost(flows, arcs):
+    return float(np.dot(flows, [arc[2] for arc in arcs]))
@@ -0,0 +1,159 @@
+from collections import deque
+
+import numpy as np
+
+TOLERANCE = 1e-9
+
+
+def transport_cost(allocation, cost_matrix):
+    return float(np.sum(np.asarray(allocation) * np.asarray(cost_matrix)))
+
+
+class BasisTree:
+    def __init__(self, rows_count, cols_count, cells):
+        self.rows_count = rows_count
+        self.adjacency = [set() for _ in range(rows_count + cols_count)]
+        for i, j in cells:
+            self.link(i, rows_count + j)
+        self.parent = [-1] * len(self.adjacency)
+        self.depth = [0] * len(self.adjacency)
+        self.hang(0, -1, 0)
+
+    def link(self, first, second):
+        self.adjacency[first].add(second)
+        self.adjacency[second].add(first)
+
+    def unlink(self, first, second):
+        self.adjacency[first].discard(second)
+        self.adjacency[second].discard(first)
+
+    def hang(self, root, parent, depth):
+        self.parent[root] = parent
+        self.depth[root] = depth
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for neighbour in self.adjacency[node]:
+                if neighbour != self.parent[node]:
+                    self.parent[neighbour] = node
+                    self.depth[neighbour] = self.depth[node] + 1
+                    queue.append(neighbour)
+
+    def path(self, first, second):
+        head, tail = [first], [second]
+        while first != second:
+            if self.depth[first] >= self.depth[second]:
+                first = self.parent[first]
+                head.append(first)
+            else:
+                second = self.parent[second]
+                tail.append(second)
+        return head + tail[-2::-1]
+
+    def cell(self, first, second):
+        if first < self.rows_count:
+            return first, second - self.rows_count
+        return second, first - self.rows_count
+
+    def subtree(self, node):
+        nodes = [node]
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            for neighbour in self.adjacency[current]:
+                if neighbour != self.parent[current]:
+                    nodes.append(neighbour)
+                    queue.append(neighbour)
+        return nodes
+
+
+def initial_basis(allocation, cost_matrix):
+    rows_count, cols_count = allocation.shape
+    root = list(range(rows_count + cols_count))
+
+    def find(node):
+        while root[node] != node:
+            root[node] = root[root[node]]
+            node = root[node]
+        return node
+
+    def join(i, j):
+        first, second = find(i), find(rows_count + j)
+        if first == second:
+            return False
+        root[first] = second
+        return True
+
+    cells = []
+    for i, j in zip(*np.nonzero(allocation > TOLERANCE)):
+        if not join(i, j):
+            raise ValueError("The initial plan is not a basic solution: its cells form a cycle")
+        cells.append((int(i), int(j)))
+
+    # Degenerate plans are completed with zero (epsilon) basic cells, cheapest first
+    for flat in np.argsort(cost_matrix, axis=None, kind="stable"):
+        if len(cells) == rows_count + cols_count - 1:
+            break
+        i, j = divmod(int(flat), cols_count)
+        if allocation[i, j] <= TOLERANCE and join(i, j):
+            cells.append((i, j))
+
+    return cells
+
+
+def potential_method(supply, demand, cost_matrix, allocation, max_iterations=None):
+    cost = np.asarray(cost_matrix, dtype=np.float64)
+    allocation = np.array(allocation, dtype=np.float64)
+    rows_count, cols_count = cost.shape
+
+    if not np.allclose(allocation.sum(axis=1), supply) or not np.allclose(allocation.sum(axis=0), demand):
+        raise ValueError("The initial plan does not match supply and demand")
+
+    tree = BasisTree(rows_count, cols_count, initial_basis(allocation, cost))
+
+    potentials = np.zeros(rows_count + cols_count)
+    for node in tree.subtree(0)[1:]:
+        parent = tree.parent[node]
+        i, j = tree.cell(node, parent)
+        potentials[node] = cost[i, j] - potentials[parent]
+
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        reduced = cost - potentials[:rows_count, np.newaxis] - potentials[np.newaxis, rows_count:]
+        flat = int(np.argmin(reduced))
+        if reduced.flat[flat] >= -TOLERANCE:
+            break
+        iterations += 1
+        enter_i, enter_j = divmod(flat, cols_count)
+
+        path = tree.path(enter_i, rows_count + enter_j)
+        donors = [tree.cell(path[k], path[k + 1]) for k in range(0, len(path) - 1, 2)]
+        receivers = [tree.cell(path[k], path[k + 1]) for k in range(1, len(path) - 1, 2)]
+
+        leave = min(range(len(donors)), key=lambda k: allocation[donors[k]])
+        theta = allocation[donors[leave]]
+        for cell in donors:
+            allocation[cell] -= theta
+        for cell in receivers:
+            allocation[cell] += theta
+        allocation[enter_i, enter_j] = theta
+        allocation[donors[leave]] = 0
+
+        first, second = path[2 * leave], path[2 * leave + 1]
+        child = first if tree.parent[first] == second else second
+        tree.unlink(first, second)
+        detached = tree.subtree(child)
+
+        delta = reduced[enter_i, enter_j]
+        in_detached = set(detached)
+        if enter_i in in_detached:
+            inner, outer, shift = enter_i, rows_count + enter_j, delta
+        else:
+            inner, outer, shift = rows_count + enter_j, enter_i, -delta
+        for node in detached:
+            potentials[node] += shift if node < rows_count else -shift
+
+        tree.link(inner, outer)
+        tree.hang(inner, outer, tree.depth[outer] + 1)
+
+    return allocation, iterations
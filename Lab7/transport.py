@@ -0,0 +1,324 @@
+import heapq
+
+import numpy as np
+
+from common.instrumentation import count, timer, traced
+from .potentials import TOLERANCE, potential_method, transport_cost
+
+
+@traced("lab7.northwest_corner")
+def northwest_corner(supply, demand, cost_matrix):
+    s = supply.copy()
+    d = demand.copy()
+    allocation = np.zeros_like(cost_matrix)
+    i = j = 0
+    while i < len(s) and j < len(d):
+        qty = min(s[i], d[j])
+        allocation[i][j] = qty
+        s[i] -= qty
+        d[j] -= qty
+        if s[i] == 0: i += 1
+        if d[j] == 0: j += 1
+    return allocation
+
+
+@traced("lab7.least_cost")
+def least_cost(supply, demand, cost_matrix):
+    allocation = np.zeros_like(cost_matrix)
+    for i, j, qty in least_cost_sparse(supply, demand, cost_matrix):
+        allocation[i][j] = qty
+    return allocation
+
+
+@traced("lab7.least_cost_sparse")
+def least_cost_sparse(supply, demand, cost_matrix, batch=16):
+    s = supply.copy()
+    d = demand.copy()
+    cost = np.asarray(cost_matrix)
+    col_live = np.array([amount > 0 for amount in d], dtype=bool)
+    live_rows = sum(amount > 0 for amount in s)
+    live_cols = int(col_live.sum())
+
+    # Every live row exposes only its cheapest live routes; the buffer doubles on each refill
+    buffers = [[] for _ in s]
+    positions = [0] * len(s)
+    sizes = [batch] * len(s)
+    heap = []
+
+    def refill(i):
+        live = np.flatnonzero(col_live)
+        row = cost[i, live]
+        k = min(sizes[i], len(row))
+        bound = np.partition(row, k - 1)[k - 1]
+        picked = np.flatnonzero(row <= bound)
+        picked = picked[np.argsort(row[picked], kind="stable")]
+        buffers[i] = list(zip(row[picked].tolist(), live[picked].tolist()))
+        positions[i] = 0
+        sizes[i] *= 2
+        heapq.heappush(heap, (buffers[i][0][0], i, buffers[i][0][1]))
+
+    if live_cols:
+        for i in range(len(s)):
+            if s[i] > 0:
+                refill(i)
+
+    allocations = []
+    while live_rows and live_cols:
+        _, i, j = heapq.heappop(heap)
+        if s[i] == 0:
+            continue
+
+        if d[j] > 0:
+            qty = min(s[i], d[j])
+            allocations.append((i, j, qty))
+            s[i] -= qty
+            d[j] -= qty
+            if d[j] == 0:
+                col_live[j] = False
+                live_cols -= 1
+            if s[i] == 0:
+                live_rows -= 1
+                continue
+
+        positions[i] += 1
+        if positions[i] < len(buffers[i]):
+            heapq.heappush(heap, (buffers[i][positions[i]][0], i, buffers[i][positions[i]][1]))
+        elif live_cols:
+            refill(i)
+
+    return allocations
+
+
+class VogelPenalties:
+    def __init__(self, cost, amounts, other_amounts, rank):
+        self.cost = cost
+        self.rank = rank
+        self.alive = [amount > 0 for amount in amounts]
+        self.other_alive = [amount > 0 for amount in other_amounts]
+        self.order = np.argsort(cost, axis=1, kind="stable")
+
+        lines_count, others_count = cost.shape
+        self.first_pos = [0] * lines_count
+        self.second_pos = [1] * lines_count
+        self.top1 = np.full(lines_count, -1)
+        self.top2 = np.full(lines_count, -1)
+
+        if others_count >= 2:
+            self.top1[:] = self.order[:, 0]
+            self.top2[:] = self.order[:, 1]
+            lowest = np.take_along_axis(cost, self.order[:, :2], axis=1)
+            penalties = lowest[:, 1] - lowest[:, 0]
+        else:
+            self.top1[:] = self.order[:, 0]
+            penalties = cost[:, 0]
+        self.penalties = list(penalties)
+
+        other_dead = np.logical_not(self.other_alive)
+        stale = other_dead[self.top1] | ((self.top2 >= 0) & other_dead[self.top2])
+        for i in np.nonzero(stale)[0]:
+            self.refresh(int(i))
+
+    def refresh(self, i):
+        order = self.order[i]
+        others_count = len(order)
+
+        first = self.first_pos[i]
+        while first < others_count and not self.other_alive[order[first]]:
+            first += 1
+        second = max(self.second_pos[i], first + 1)
+        while second < others_count and not self.other_alive[order[second]]:
+            second += 1
+        self.first_pos[i] = first
+        self.second_pos[i] = second
+
+        self.top1[i] = order[first] if first < others_count else -1
+        self.top2[i] = order[second] if second < others_count else -1
+
+        if self.top2[i] >= 0:
+            self.penalties[i] = self.cost[i][self.top2[i]] - self.cost[i][self.top1[i]]
+        elif self.top1[i] >= 0:
+            self.penalties[i] = self.cost[i][self.top1[i]]
+        else:
+            self.penalties[i] = -1
+
+    def entry(self, i):
+        return -self.penalties[i], self.rank, -i
+
+    def entries(self):
+        return [self.entry(i) for i in range(len(self.alive)) if self.alive[i]]
+
+    def is_current(self, entry):
+        i = -entry[2]
+        return self.alive[i] and self.penalties[i] == -entry[0]
+
+    def other_died(self, other, heap):
+        self.other_alive[other] = False
+        for i in np.nonzero((self.top1 == other) | (self.top2 == other))[0]:
+            i = int(i)
+            if self.alive[i]:
+                self.refresh(i)
+                heapq.heappush(heap, self.entry(i))
+
+
+@traced("lab7.vogels_approximation")
+def vogels_approximation(supply, demand, cost_matrix):
+    s = supply.copy()
+    d = demand.copy()
+    allocation = np.zeros_like(cost_matrix)
+    cost = np.array(cost_matrix)
+
+    rows = VogelPenalties(cost, s, d, 0)
+    cols = VogelPenalties(cost.T, d, s, 1)
+    live_rows = sum(rows.alive)
+    live_cols = sum(cols.alive)
+
+    heap = rows.entries() + cols.entries()
+    heapq.heapify(heap)
+
+    while live_rows and live_cols and heap:
+        entry = heap[0]
+        lines = rows if entry[1] == 0 else cols
+        if not lines.is_current(entry):
+            heapq.heappop(heap)
+            continue
+        if entry[0] > 0:
+            break
+
+        if lines is rows:
+            i = -entry[2]
+            j = int(rows.top1[i])
+        else:
+            j = -entry[2]
+            i = int(cols.top1[j])
+
+        qty = min(s[i], d[j])
+        allocation[i][j] = qty
+        s[i] -= qty
+        d[j] -= qty
+
+        if s[i] == 0:
+            rows.alive[i] = False
+            live_rows -= 1
+            cols.other_died(i, heap)
+        if d[j] == 0:
+            cols.alive[j] = False
+            live_cols -= 1
+            rows.other_died(j, heap)
+
+    return allocation
+
+
+def complete_plan(supply, demand, allocation):
+    # Vogel stops once every penalty is negative, which negative costs allow; the rest is filled northwest-corner style
+    allocation = np.asarray(allocation, dtype=np.float64)
+    remaining_supply = np.asarray(supply, dtype=np.float64) - allocation.sum(axis=1)
+    remaining_demand = np.asarray(demand, dtype=np.float64) - allocation.sum(axis=0)
+    remaining_supply[remaining_supply <= TOLERANCE] = 0
+    remaining_demand[remaining_demand <= TOLERANCE] = 0
+    if not remaining_supply.any() and not remaining_demand.any():
+        return allocation
+    return allocation + northwest_corner(remaining_supply.tolist(), remaining_demand.tolist(), np.zeros_like(allocation))
+
+
+def balance(supply, demand, cost_matrix):
+    supply = list(supply)
+    demand = list(demand)
+    # Allocations are created like the cost matrix, so integer costs would truncate fractional amounts
+    cost_matrix = np.asarray(cost_matrix, dtype=np.float64)
+
+    total_supply = sum(supply)
+    total_demand = sum(demand)
+
+    # Float sums of fractional amounts rarely match exactly, so a rounding residue gets no dummy line
+    if total_supply - total_demand > TOLERANCE:
+        demand.append(total_supply - total_demand)
+        cost_matrix = np.hstack([cost_matrix, np.zeros((len(supply), 1), dtype=cost_matrix.dtype)])
+    elif total_demand - total_supply > TOLERANCE:
+        supply.append(total_demand - total_supply)
+        cost_matrix = np.vstack([cost_matrix, np.zeros((1, len(demand)), dtype=cost_matrix.dtype)])
+
+    return supply, demand, cost_matrix
+
+
+class TransportProblem:
+    METHODS = ("northwest_corner", "least_cost", "vogels_approximation")
+
+    def __init__(self, supply, demand, cost_matrix):
+        self.suppliers_count = len(supply)
+        self.consumers_count = len(demand)
+        cost_matrix = np.asarray(cost_matrix, dtype=np.float64)
+        if cost_matrix.shape != (self.suppliers_count, self.consumers_count):
+            raise ValueError(f"cost_matrix must have shape {self.suppliers_count}x{self.consumers_count}, "
+                             f"got {'x'.join(map(str, cost_matrix.shape))}")
+        self.supply, self.demand, self.cost_matrix = balance(supply, demand, cost_matrix)
+
+    def northwest_corner(self):
+        return northwest_corner(self.supply, self.demand, self.cost_matrix)
+
+    def least_cost(self, sparse=False):
+        if sparse:
+            return least_cost_sparse(self.supply, self.demand, self.cost_matrix)
+        return least_cost(self.supply, self.demand, self.cost_matrix)
+
+    def vogels_approximation(self):
+        return vogels_approximation(self.supply, self.demand, self.cost_matrix)
+
+    def initial_plan(self, method="vogels_approximation"):
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}")
+        return getattr(self, method)()
+
+    def optimize(self, allocation=None, method="vogels_approximation"):
+        if allocation is None:
+            allocation = self.initial_plan(method)
+        allocation = complete_plan(self.supply, self.demand, allocation)
+        with timer("lab7.potential_method"):
+            allocation, iterations = potential_method(self.supply, self.demand, self.cost_matrix, allocation)
+        count("lab7.potential_iterations", iterations)
+        return allocation, iterations
+
+    def cost(self, allocation):
+        return transport_cost(allocation, self.cost_matrix)
+
+
+_shared_cost = None
+
+
+def _attach_cost(name, shape, dtype):
+    from multiprocessing.shared_memory import SharedMemory
+
+    global _shared_cost
+    memory = SharedMemory(name=name)
+    _shared_cost = (memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+
+def _solve_scenario(supply, demand, method, optimize, cost_matrix=None):
+    if cost_matrix is None:
+        cost_matrix = _shared_cost[1]
+    problem = TransportProblem(supply, demand, cost_matrix)
+    allocation = problem.initial_plan(method)
+    iterations = 0
+    if optimize:
+        allocation, iterations = problem.optimize(allocation)
+    return allocation, problem.cost(allocation), iterations
+
+
+def solve_scenarios(cost_matrix, scenarios, method="vogels_approximation", optimize=True, workers=None):
+    cost_matrix = np.ascontiguousarray(cost_matrix)
+    if workers == 1:
+        return [_solve_scenario(supply, demand, method, optimize, cost_matrix) for supply, demand in scenarios]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+    memory = SharedMemory(create=True, size=max(cost_matrix.nbytes, 1))
+    try:
+        np.ndarray(cost_matrix.shape, dtype=cost_matrix.dtype, buffer=memory.buf)[:] = cost_matrix
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_cost,
+                                 initargs=(memory.name, cost_matrix.shape, cost_matrix.dtype)) as executor:
+            futures = [executor.submit(_solve_scenario, supply, demand, method, optimize)
+                       for supply, demand in scenarios]
+            return [future.result() for future in futures]
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+
+from benchmarks import harness
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the lab solvers.")
+    parser.add_argument("pattern", nargs="?", default="*", help="glob over case names, e.g. 'lab7.*'")
+    parser.add_argument("--quick", action="store_true", help="run only the small sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<28} {'size':>8} {'p50, ms':>10} {'p90, ms':>10} {'p99, ms':>10} {'items/s':>12} {'peak, MiB':>9}")
+    results = harness.run_benchmarks(args.pattern, args.quick, args.seed, args.repeats)
+
+    if args.output:
+        harness.save(results, args.output)
+
+    if args.update_baseline:
+        harness.save(results, args.baseline)
+        print(f"Baseline saved to '{args.baseline}'")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at '{args.baseline}'; run with --update-baseline to create one.")
+        return 0
+
+    regressions = harness.compare(results, harness.load_baseline(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} of '{args.baseline}'")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
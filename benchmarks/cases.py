@@ -0,0 +1,150 @@
+import contextlib
+import io
+from dataclasses import dataclass
+
+from benchmarks import generators
+from benchmarks.labs import load
+
+
+@dataclass
+class Case:
+    name: str
+    setup: object
+    sizes: tuple
+    quick_sizes: tuple
+
+
+CASES = {}
+
+
+def case(name, sizes, quick_sizes):
+    def decorator(setup):
+        CASES[name] = Case(name, setup, sizes, quick_sizes)
+        return setup
+
+    return decorator
+
+
+@case("lab1.pareto_slater", sizes=(100, 300, 1000), quick_sizes=(50, 100))
+def lab1_pareto_slater(size, seed):
+    lab1 = load("Lab1")
+    a_list = generators.alternatives(size, seed)
+
+    def run():
+        for alt in a_list:
+            alt.pareto = alt.slater = None
+        lab1.mark_dominated(a_list)
+
+    return run, size * (size - 1)
+
+
+@case("lab2.solve_lp", sizes=(10, 50, 200), quick_sizes=(10, 50))
+def lab2_solve_lp(size, seed):
+    lab2 = load("Lab2")
+    lp_data = generators.linear_program(size, seed)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            lab2.solve_lp(lp_data)
+
+    return run, size
+
+
+@case("lab3.packing", sizes=(50, 100, 150), quick_sizes=(20, 50))
+def lab3_packing(size, seed):
+    lab3 = load("Lab3")
+    table = generators.weights_table(size, seed)
+
+    def run():
+        algorithm = lab3.NPAlgorithm(table, 100)
+        algorithm.get_table_result(False)
+        algorithm.get_table_result(True)
+
+    return run, table.size
+
+
+@case("lab6.evaluate_batch", sizes=(4, 16, 64), quick_sizes=(4, 16))
+def lab6_evaluate_batch(size, seed):
+    criteria = load("Lab6", "criteria")
+    payoffs = generators.payoff_batch(size, seed)
+
+    def run():
+        criteria.evaluate_batch(payoffs)
+
+    return run, payoffs.size
+
+
+@case("lab6.stream_evaluate", sizes=(10000, 100000, 500000), quick_sizes=(10000,))
+def lab6_stream_evaluate(size, seed):
+    streaming = load("Lab6", "streaming")
+    matrix = generators.payoff_matrix(size, seed)
+
+    def run():
+        streaming.stream_evaluate(matrix, chunk_rows=8192)
+
+    return run, matrix.size
+
+
+@case("lab6.hurwitz_sweep", sizes=(1000, 10000, 100000), quick_sizes=(1000,))
+def lab6_hurwitz_sweep(size, seed):
+    criteria = load("Lab6", "criteria")
+    matrix = generators.payoff_matrix(size, seed, states_count=16)
+
+    def run():
+        criteria.hurwitz_sweep(matrix)
+
+    return run, size
+
+
+@case("lab6.pruned_evaluate", sizes=(10000, 100000, 1000000), quick_sizes=(10000,))
+def lab6_pruned_evaluate(size, seed):
+    pruning = load("Lab6", "pruning")
+    matrix = generators.dominated_payoff_matrix(size, seed)
+
+    def run():
+        candidates = pruning.Candidates(matrix)
+        for pessimism in (0.1, 0.5, 0.9):
+            candidates.evaluate(pessimism)
+
+    return run, matrix.size
+
+
+def _transport_case(method):
+    def setup(size, seed):
+        transport = load("Lab7", "transport")
+        supply, demand, cost_matrix = generators.transport_problem(size, seed)
+        function = getattr(transport, method)
+
+        def run():
+            function(supply, demand, cost_matrix)
+
+        return run, cost_matrix.size
+
+    return setup
+
+
+for _method in ("northwest_corner", "least_cost", "least_cost_sparse", "vogels_approximation"):
+    case(f"lab7.{_method}", sizes=(100, 300, 1000), quick_sizes=(50, 100))(_transport_case(_method))
+
+
+@case("lab7.potential_method", sizes=(30, 100, 200), quick_sizes=(20, 50))
+def lab7_potential_method(size, seed):
+    transport = load("Lab7", "transport")
+    problem = transport.TransportProblem(*generators.transport_problem(size, seed))
+    allocation = problem.northwest_corner()
+
+    def run():
+        problem.optimize(allocation)
+
+    return run, problem.cost_matrix.size
+
+
+@case("lab7.network_simplex", sizes=(100, 300, 1000), quick_sizes=(50, 100))
+def lab7_network_simplex(size, seed):
+    network_simplex = load("Lab7", "network_simplex")
+    supply, demand, arcs = generators.sparse_transport_problem(size, seed)
+
+    def run():
+        network_simplex.network_simplex(supply, demand, arcs)
+
+    return run, len(arcs)
@@ -0,0 +1,132 @@
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.labs import load
+
+
+def reference_least_cost(supply, demand, cost_matrix):
+    s = supply.copy()
+    d = demand.copy()
+    allocation = np.zeros_like(cost_matrix)
+    costs = [(i, j, cost_matrix[i][j]) for i in range(len(s)) for j in range(len(d))]
+    costs.sort(key=lambda x: x[2])
+    for i, j, _ in costs:
+        if s[i] > 0 and d[j] > 0:
+            qty = min(s[i], d[j])
+            allocation[i][j] = qty
+            s[i] -= qty
+            d[j] -= qty
+    return allocation
+
+
+def reference_vogels_approximation(supply, demand, cost_matrix):
+    s = supply.copy()
+    d = demand.copy()
+    allocation = np.zeros_like(cost_matrix)
+    cost = np.array(cost_matrix)
+
+    while np.any(s) and np.any(d):
+        penalties = []
+        for i in range(len(s)):
+            if s[i] > 0:
+                row = [cost[i][j] for j in range(len(d)) if d[j] > 0]
+                if len(row) >= 2:
+                    sorted_row = sorted(row)
+                    penalty = sorted_row[1] - sorted_row[0]
+                elif len(row) == 1:
+                    penalty = row[0]
+                else:
+                    penalty = -1
+                penalties.append((penalty, 'row', i))
+        for j in range(len(d)):
+            if d[j] > 0:
+                col = [cost[i][j] for i in range(len(s)) if s[i] > 0]
+                if len(col) >= 2:
+                    sorted_col = sorted(col)
+                    penalty = sorted_col[1] - sorted_col[0]
+                elif len(col) == 1:
+                    penalty = col[0]
+                else:
+                    penalty = -1
+                penalties.append((penalty, 'col', j))
+
+        penalties = [p for p in penalties if p[0] >= 0]
+        if not penalties:
+            break
+
+        penalties.sort(reverse=True)
+        _, typ, idx = penalties[0]
+
+        if typ == 'row':
+            i = idx
+            available = [(cost[i][j], j) for j in range(len(d)) if d[j] > 0]
+            _, j = min(available)
+        else:
+            j = idx
+            available = [(cost[i][j], i) for i in range(len(s)) if s[i] > 0]
+            _, i = min(available)
+
+        qty = min(s[i], d[j])
+        allocation[i][j] = qty
+        s[i] -= qty
+        d[j] -= qty
+
+    return allocation
+
+
+def random_instance(rng):
+    suppliers_count, consumers_count = rng.integers(1, 9, 2)
+    supply = rng.integers(0, 40, suppliers_count).tolist()
+    demand = rng.integers(0, 40, consumers_count).tolist()
+    kind = rng.integers(4)
+    if kind == 0:
+        # Few distinct values give many tied costs and penalties
+        cost_matrix = rng.integers(0, 4, (suppliers_count, consumers_count)).astype(float)
+    elif kind == 1:
+        cost_matrix = rng.integers(-20, 20, (suppliers_count, consumers_count)).astype(float)
+    elif kind == 2:
+        cost_matrix = np.round(rng.random((suppliers_count, consumers_count)) * 10, 1)
+    else:
+        cost_matrix = rng.integers(1, 1000, (suppliers_count, consumers_count)).astype(float)
+    return supply, demand, cost_matrix
+
+
+def check(instances_count, seed=0):
+    transport = load("Lab7", "transport")
+    rng = np.random.default_rng(seed)
+    mismatches = {"least_cost": 0, "least_cost_sparse": 0, "vogels_approximation": 0}
+    for _ in range(instances_count):
+        supply, demand, cost_matrix = random_instance(rng)
+
+        expected = reference_least_cost(supply, demand, cost_matrix)
+        if not np.array_equal(transport.least_cost(supply, demand, cost_matrix), expected):
+            mismatches["least_cost"] += 1
+        routes = np.zeros_like(cost_matrix)
+        for i, j, qty in transport.least_cost_sparse(supply, demand, cost_matrix):
+            routes[i, j] = qty
+        if not np.array_equal(routes, expected):
+            mismatches["least_cost_sparse"] += 1
+
+        expected = reference_vogels_approximation(supply, demand, cost_matrix)
+        if not np.array_equal(transport.vogels_approximation(supply, demand, cost_matrix), expected):
+            mismatches["vogels_approximation"] += 1
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.check_equivalence",
+                                     description="Compare the fast Lab7 initial plans with the original ones.")
+    parser.add_argument("--instances", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mismatches = check(args.instances, args.seed)
+    for name, mismatches_count in mismatches.items():
+        print(f"{name:<24} {mismatches_count} mismatches in {args.instances} random instances")
+    return 1 if any(mismatches.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
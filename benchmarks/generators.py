@@ -0,0 +1,59 @@
+import numpy as np
+
+from benchmarks.labs import load
+
+
+def alternatives(size, seed=0, criteria_count=2):
+    lab1 = load("Lab1")
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 10, (size, criteria_count)).tolist()
+    return [lab1.Alternative(f"A{i + 1}", *row) for i, row in enumerate(values)]
+
+
+def linear_program(size, seed=0):
+    lab2 = load("Lab2")
+    rng = np.random.default_rng(seed)
+    constraints_count = max(1, size // 2)
+    lp_data = lab2.LPData(
+        a_matrix=rng.integers(1, 10, (constraints_count, size)).astype(float).tolist(),
+        b_vector=rng.integers(10 * size, 100 * size, constraints_count).astype(float).tolist(),
+        f_vector=rng.integers(1, 30, size).astype(float).tolist(),
+        signs=["<="] * constraints_count,
+        optimization_goal=lab2.OptimizationGoal.MAX,
+        x_count=size,
+    )
+    return lp_data
+
+
+def weights_table(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(2, 91, (3, size))
+
+
+def payoff_batch(size, seed=0, batch=None, states_count=None):
+    rng = np.random.default_rng(seed)
+    batch = batch or max(1, 100000 // (size * size))
+    return rng.integers(0, 100, (batch, size, states_count or size)).astype(float)
+
+
+def payoff_matrix(size, seed=0, states_count=64):
+    rng = np.random.default_rng(seed)
+    return rng.random((size, states_count))
+
+
+def dominated_payoff_matrix(size, seed=0, states_count=8, front_count=10):
+    benchmark = load("Lab6", "benchmark_pruning")
+    return benchmark.dominated_matrix(size, states_count, front_count, seed)
+
+
+def transport_problem(size, seed=0):
+    rng = np.random.default_rng(seed)
+    supply = rng.integers(1, 100, size).tolist()
+    demand = rng.integers(1, 100, size).tolist()
+    cost_matrix = rng.integers(1, 1000, (size, size)).astype(float)
+    return supply, demand, cost_matrix
+
+
+def sparse_transport_problem(size, seed=0, routes_per_supplier=5):
+    benchmark = load("Lab7", "benchmark_network_simplex")
+    return benchmark.random_instance(size, size, min(routes_per_supplier, size), seed)
@@ -0,0 +1,95 @@
+import fnmatch
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.cases import CASES
+
+
+def measure(case, size, seed=0, repeats=5):
+    run, items = case.setup(size, seed)
+    run()
+
+    latencies = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]).tolist()
+    return {
+        "repeats": repeats,
+        "p50": p50,
+        "p90": p90,
+        "p99": p99,
+        "mean": float(np.mean(latencies)),
+        "throughput": items / p50 if p50 else float("inf"),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run_benchmarks(pattern="*", quick=False, seed=0, repeats=5, report=print):
+    results = {}
+    for name, case in CASES.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        results[name] = {}
+        for size in case.quick_sizes if quick else case.sizes:
+            result = measure(case, size, seed, repeats)
+            results[name][str(size)] = result
+            report(f"{name:<28} {size:>8} {result['p50'] * 1e3:>10.2f} {result['p90'] * 1e3:>10.2f} "
+                   f"{result['p99'] * 1e3:>10.2f} {result['throughput']:>12.4g} {result['peak_bytes'] / 2 ** 20:>9.2f}")
+    return results
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+    }
+
+
+def save(results, file_name):
+    with open(file_name, "w", encoding="utf-8") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+def load_baseline(file_name):
+    with open(file_name, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare(results, baseline, threshold=0.25, time_slack=2e-3, memory_slack=2 ** 20, report=print):
+    regressions = []
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is None:
+                report(f"NO BASELINE {name}[{size}]: not checked, run with --update-baseline to record it")
+                continue
+            if current["p50"] > previous["p50"] * (1 + threshold) + time_slack:
+                regressions.append(f"{name}[{size}]: p50 {previous['p50'] * 1e3:.2f} ms -> {current['p50'] * 1e3:.2f} ms")
+            if current["peak_bytes"] > previous["peak_bytes"] * (1 + threshold) + memory_slack:
+                regressions.append(f"{name}[{size}]: peak memory {previous['peak_bytes'] / 2 ** 20:.2f} MiB -> "
+                                   f"{current['peak_bytes'] / 2 ** 20:.2f} MiB")
+    return regressions
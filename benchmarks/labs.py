@@ -0,0 +1,5 @@
+import importlib
+
+
+def load(lab, module="main"):
+    return importlib.import_module(f"{lab}.{module}")
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks import generators
+from labs.server import LabServer
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def payloads(requests_count, seed=0):
+    rng = np.random.default_rng(seed)
+    supply, demand, cost_matrix = generators.transport_problem(8, seed)
+    transport = {"supply": supply, "demand": demand, "cost_matrix": cost_matrix.tolist()}
+    mixed = [
+        ("/pareto", {"alternatives": rng.integers(0, 10, (50, 2)).tolist()}),
+        ("/lp", {"a_matrix": [[1, 6, 2], [3, -1, 2], [2, 3, -1]], "b_vector": [18, 12, 16],
+                 "f_vector": [3, -6, -2], "signs": ["<=", "<=", "<="], "goal": "min"}),
+        ("/packing", {"weights": rng.integers(2, 91, 20).tolist(), "sort": True}),
+        ("/transport", transport),
+    ]
+    result = []
+    for k in range(requests_count):
+        if k % 5 == 4:
+            result.append(mixed[(k // 5) % len(mixed)])
+        else:
+            result.append(("/nature", {"matrix": rng.integers(0, 100, (6, 6)).tolist(), "pessimism": 0.9}))
+    return result
+
+
+async def load(port, jobs, concurrency):
+    queue = list(reversed(jobs))
+    statuses = {}
+
+    async def client():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            while queue:
+                path, payload = queue.pop()
+                status, _ = await request(reader, writer, "POST", path, payload)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return time.perf_counter() - start, statuses
+
+
+async def run(args, max_batch):
+    server = LabServer(args.workers, args.max_pending, max_batch=max_batch)
+    await server.start(port=0)
+    try:
+        port = server.server.sockets[0].getsockname()[1]
+        elapsed, statuses = await load(port, payloads(args.requests, args.seed), args.concurrency)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        _, metrics = await request(reader, writer, "GET", "/metrics")
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        await server.close()
+    return elapsed, statuses, metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.server_load",
+                                     description="Load the lab server on localhost with batched and unbatched runs.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for title, max_batch in (("without batching", 1), ("with micro-batching", 64)):
+        elapsed, statuses, metrics = asyncio.run(run(args, max_batch))
+        print(f"\n{title}: {args.requests} requests in {elapsed:.2f} s ({args.requests / elapsed:.0f} req/s), "
+              f"statuses {statuses}")
+        print(f"{'endpoint':<12} {'requests':>8} {'rejected':>8} {'p50, ms':>8} {'p99, ms':>8} {'batch':>6}")
+        for name, endpoint in sorted(metrics.items()):
+            print(f"{name:<12} {endpoint['requests']:>8} {endpoint['rejected']:>8} {endpoint.get('p50_ms', 0):>8.2f} "
+                  f"{endpoint.get('p99_ms', 0):>8.2f} {endpoint.get('mean_batch', 1):>6.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LABS = ("Lab1", "Lab2", "Lab3", "Lab6", "Lab7")
+HEAVY_MODULES = ("pandas", "openpyxl", "matplotlib", "scipy", "prettytable", "tabulate")
+
+# Labs may print while they are imported, so only the line after the sentinel is parsed
+SENTINEL = "heavy modules:"
+PROBE = ("import sys; import {module}; "
+         "print('\\n" + SENTINEL + "', ' '.join(name for name in {heavy!r} if name in sys.modules))")
+
+
+def cold_start(command, cwd, repeats):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+        latencies.append(time.perf_counter() - start)
+        if result.returncode:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr}")
+    lines = [line for line in result.stdout.splitlines() if line.startswith(SENTINEL)]
+    return float(np.median(latencies)), lines[-1][len(SENTINEL):].split() if lines else []
+
+
+def measure_tree(root, package_layout, repeats):
+    results = {}
+    for lab in LABS:
+        if package_layout:
+            command = [sys.executable, "-c", PROBE.format(module=f"{lab}.main", heavy=HEAVY_MODULES)]
+            cwd = root
+        else:
+            command = [sys.executable, "-c", PROBE.format(module="main", heavy=HEAVY_MODULES)]
+            cwd = os.path.join(root, lab)
+        latency, loaded = cold_start(command, cwd, repeats)
+        results[lab] = {"cold_start": latency, "heavy_modules": loaded}
+    return results
+
+
+def export_revision(revision, directory):
+    archive = os.path.join(directory, "tree.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, revision], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(directory)
+    return directory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="Measure the cold-start latency of importing every lab.")
+    parser.add_argument("--before", help="git revision to compare with, e.g. a commit before the package layout")
+    parser.add_argument("--before-scripts", action="store_true",
+                        help="the --before revision uses the old per-directory script layout")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    interpreter, _ = cold_start([sys.executable, "-c", "pass"], ROOT, args.repeats)
+    print(f"Bare interpreter start: {interpreter * 1e3:.1f} ms\n")
+
+    results = {"interpreter": interpreter, "after": measure_tree(ROOT, True, args.repeats)}
+    if args.before:
+        with tempfile.TemporaryDirectory() as directory:
+            tree = export_revision(args.before, directory)
+            results["before"] = measure_tree(tree, not args.before_scripts, args.repeats)
+
+    print(f"{'lab':<6} {'before, ms':>11} {'after, ms':>10}  heavy modules loaded (before -> after)")
+    for lab in LABS:
+        after = results["after"][lab]
+        before = results.get("before", {}).get(lab)
+        before_time = f"{before['cold_start'] * 1e3:>11.1f}" if before else f"{'-':>11}"
+        before_modules = ",".join(before["heavy_modules"]) or "none" if before else "-"
+        print(f"{lab:<6} {before_time} {after['cold_start'] * 1e3:>10.1f}  "
+              f"{before_modules} -> {','.join(after['heavy_modules']) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import atexit
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# LABS_INSTRUMENT: "" (off), "summary" (counters and timers) or "trace" (also every call).
+# It is read once at import, so disabled decorators return the original function untouched.
+MODE = os.environ.get("LABS_INSTRUMENT", "").lower()
+ENABLED = MODE in ("1", "summary", "trace")
+TRACING = MODE == "trace"
+OUTPUT = os.environ.get("LABS_INSTRUMENT_OUTPUT", "instrumentation.jsonl")
+
+_lock = threading.Lock()
+_origin = time.perf_counter()
+counters = {}
+timers = {}
+events = []
+
+
+class Counter:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def publish(self):
+        count(self.name, self.value)
+        return self.value
+
+
+def count(name, amount=1):
+    if not ENABLED:
+        return
+    with _lock:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def _record(name, start, wall, cpu):
+    with _lock:
+        calls, total_wall, total_cpu = timers.get(name, (0, 0.0, 0.0))
+        timers[name] = (calls + 1, total_wall + wall, total_cpu + cpu)
+        if TRACING:
+            events.append((name, start - _origin, wall, cpu, threading.get_ident()))
+
+
+@contextmanager
+def _timer(name):
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        _record(name, start, time.perf_counter() - start, time.thread_time() - cpu_start)
+
+
+def timer(name):
+    return _timer(name) if ENABLED else nullcontext()
+
+
+def traced(name):
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _timer(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _json_lines():
+    for name, value in sorted(counters.items()):
+        yield {"type": "counter", "name": name, "value": value}
+    for name, (calls, wall, cpu) in sorted(timers.items()):
+        yield {"type": "timer", "name": name, "calls": calls, "wall": wall, "cpu": cpu}
+    for name, start, wall, cpu, thread in events:
+        yield {"type": "call", "name": name, "start": start, "wall": wall, "cpu": cpu, "thread": thread}
+
+
+def _chrome_trace():
+    pid = os.getpid()
+    trace_events = [{"name": name, "ph": "X", "ts": start * 1e6, "dur": wall * 1e6, "pid": pid, "tid": thread,
+                     "args": {"cpu_us": cpu * 1e6}} for name, start, wall, cpu, thread in events]
+    now = (time.perf_counter() - _origin) * 1e6
+    trace_events += [{"name": name, "ph": "C", "ts": now, "pid": pid, "args": {"value": value}}
+                     for name, value in sorted(counters.items())]
+    trace_events += [{"name": f"{name} (total)", "ph": "C", "ts": now, "pid": pid,
+                      "args": {"calls": calls, "wall_ms": wall * 1e3, "cpu_ms": cpu * 1e3}}
+                     for name, (calls, wall, cpu) in sorted(timers.items())]
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def dump(file_name=None):
+    import json
+
+    file_name = file_name or OUTPUT
+    with _lock:
+        if file_name.endswith(".json"):
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(_chrome_trace(), file)
+        else:
+            with open(file_name, "a", encoding="utf-8") as file:
+                for line in _json_lines():
+                    file.write(json.dumps(line) + "\n")
+
+
+def reset():
+    with _lock:
+        counters.clear()
+        timers.clear()
+        events.clear()
+
+
+if ENABLED:
+    atexit.register(dump)
@@ -0,0 +1,268 @@
+import csv
+import math
+import numbers
+import os
+import sys
+import zipfile
+
+FORMATS = ("xlsx", "csv", "parquet")
+
+
+STYLES = ("cell", "bold", "header")
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+{sheets}</Types>"""
+
+ROOT_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets>{sheets}</sheets>
+</workbook>"""
+
+WORKBOOK_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+{sheets}</Relationships>"""
+
+# Named styles "cell", "bold" and "header" map to cellXfs 1, 2 and 3
+STYLESHEET = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>\
+<fill><patternFill patternType="solid"><fgColor rgb="00D9D9D9"/><bgColor rgb="00D9D9D9"/></patternFill></fill></fills>
+<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>\
+<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>
+<cellStyleXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>\
+<xf numFmtId="0" fontId="0" fillId="0" borderId="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>\
+<xf numFmtId="0" fontId="1" fillId="0" borderId="1" applyFont="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>\
+<xf numFmtId="0" fontId="1" fillId="2" borderId="1" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf></cellStyleXfs>
+<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>\
+<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>\
+<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="2" applyFont="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>\
+<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="3" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf></cellXfs>
+<cellStyles count="4"><cellStyle name="Normal" xfId="0" builtinId="0"/><cellStyle name="cell" xfId="1"/>\
+<cellStyle name="bold" xfId="2"/><cellStyle name="header" xfId="3"/></cellStyles>
+</styleSheet>"""
+
+
+# Characters outside the XML 1.0 range make Excel and openpyxl reject the whole sheet
+XML_ILLEGAL = dict.fromkeys([*range(0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0xD800, 0xE000), 0xFFFE, 0xFFFF])
+
+
+def escape(text, entities=None):
+    # xml.sax.saxutils.escape pulls in urllib, which is a noticeable share of the lab start-up time
+    if not text.isprintable():
+        # All of them are non-printable, so ordinary strings skip the translation
+        text = text.translate(XML_ILLEGAL)
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    for key, value in (entities or {}).items():
+        text = text.replace(key, value)
+    return text
+
+
+def _is_bool(value):
+    # Only look for NumPy booleans if NumPy is already loaded by the caller
+    numpy = sys.modules.get("numpy")
+    return isinstance(value, bool) or numpy is not None and isinstance(value, numpy.bool_)
+
+
+def _xlsx_cell(value, style_attribute):
+    value_type = type(value)
+    if value_type is str:
+        return f'<c{style_attribute} t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+    if value_type is int or value_type is float and math.isfinite(value):
+        return f"<c{style_attribute}><v>{value!r}</v></c>"
+    if value is None:
+        return f"<c{style_attribute}/>"
+    if _is_bool(value):
+        return f'<c{style_attribute} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Integral):
+        return f"<c{style_attribute}><v>{int(value)}</v></c>"
+    if isinstance(value, numbers.Real) and math.isfinite(value):
+        return f"<c{style_attribute}><v>{float(value)!r}</v></c>"
+    return f'<c{style_attribute} t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+class Report:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class XlsxSheet:
+    FLUSH_ROWS = 1024
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._rows = []
+        self._merges = []
+        self._stream.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                           b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                           b"<sheetData>")
+
+    def append(self, row, style=None):
+        style_attribute = f' s="{STYLES.index(style) + 1}"' if style is not None else ""
+        self._rows.append("<row>" + "".join(_xlsx_cell(value, style_attribute) for value in row) + "</row>")
+        if len(self._rows) >= self.FLUSH_ROWS:
+            self._flush()
+
+    def merge(self, cell_range):
+        self._merges.append(cell_range)
+
+    def _flush(self):
+        self._stream.write("".join(self._rows).encode("utf-8"))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self._stream.write(b"</sheetData>")
+        if self._merges:
+            merges = "".join(f'<mergeCell ref="{cell_range}"/>' for cell_range in self._merges)
+            self._stream.write(f'<mergeCells count="{len(self._merges)}">{merges}</mergeCells>'.encode("utf-8"))
+        self._stream.write(b"</worksheet>")
+        self._stream.close()
+
+
+class XlsxReport(Report):
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._archive = zipfile.ZipFile(file_name, "w", zipfile.ZIP_DEFLATED)
+        self._titles = []
+        self._sheet = None
+
+    def add_sheet(self, title):
+        if self._sheet is not None:
+            self._sheet.close()
+        self._titles.append(title)
+        stream = self._archive.open(f"xl/worksheets/sheet{len(self._titles)}.xml", "w", force_zip64=True)
+        self._sheet = XlsxSheet(stream)
+        return self._sheet
+
+    def close(self):
+        if self._sheet is not None:
+            self._sheet.close()
+            self._sheet = None
+
+        numbers_range = range(1, len(self._titles) + 1)
+        self._archive.writestr("[Content_Types].xml", CONTENT_TYPES.format(sheets="".join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>\n'
+            for n in numbers_range)))
+        self._archive.writestr("_rels/.rels", ROOT_RELATIONSHIPS)
+        self._archive.writestr("xl/workbook.xml", WORKBOOK.format(sheets="".join(
+            f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+            for n, title in zip(numbers_range, self._titles))))
+        self._archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELATIONSHIPS.format(sheets="".join(
+            f'<Relationship Id="rId{n}" '
+            f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{n}.xml"/>\n' for n in numbers_range)))
+        self._archive.writestr("xl/styles.xml", STYLESHEET)
+        self._archive.close()
+
+
+class CsvSheet:
+    def __init__(self, file_name):
+        self._file = open(file_name, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+
+    def append(self, row, style=None):
+        self._writer.writerow(["" if value is None else value for value in row])
+
+    def merge(self, cell_range):
+        pass
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSheet:
+    BATCH_ROWS = 65536
+
+    def __init__(self, file_name):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The parquet report format requires the 'pyarrow' package")
+
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self._file_name = file_name
+        self._writer = None
+        self._header = None
+        self._rows = []
+
+    def append(self, row, style=None):
+        if self._header is None:
+            self._header = ["" if value is None else str(value) for value in row]
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.BATCH_ROWS:
+            self._flush()
+
+    def merge(self, cell_range):
+        pass
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = list(zip(*self._rows))
+        arrays = [self._pyarrow.array([None if value is None else str(value) for value in column])
+                  if len({type(value) for value in column if value is not None}) > 1
+                  else self._pyarrow.array(column) for column in columns]
+        table = self._pyarrow.Table.from_arrays(arrays, names=self._header[:len(arrays)])
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self._file_name, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is None and self._header is not None:
+            schema = self._pyarrow.schema([(name, self._pyarrow.string()) for name in self._header])
+            self._writer = self._parquet.ParquetWriter(self._file_name, schema)
+        if self._writer is not None:
+            self._writer.close()
+
+
+class SplitReport(Report):
+    def __init__(self, file_name, sheet_class, extension):
+        self.file_name = file_name
+        self._sheet_class = sheet_class
+        self._extension = extension
+        self._sheets = []
+
+    def add_sheet(self, title):
+        stem = os.path.splitext(self.file_name)[0]
+        sheet = self._sheet_class(f"{stem}.{title}.{self._extension}")
+        self._sheets.append(sheet)
+        return sheet
+
+    def close(self):
+        for sheet in self._sheets:
+            sheet.close()
+
+
+def open_report(file_name, report_format=None):
+    if report_format is None:
+        report_format = os.environ.get("REPORT_FORMAT") or os.path.splitext(file_name)[1].lstrip(".")
+    report_format = report_format.lower()
+
+    if report_format == "xlsx":
+        return XlsxReport(file_name)
+    if report_format == "csv":
+        return SplitReport(file_name, CsvSheet, "csv")
+    if report_format == "parquet":
+        return SplitReport(file_name, ParquetSheet, "parquet")
+    raise ValueError(f"Report format must be one of {FORMATS}")
@@ -0,0 +1,20 @@
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LABS = {
+    "lab1": ("Lab1", "Multi-criteria choice by Pareto and Slater"),
+    "lab2": ("Lab2", "Linear programming"),
+    "lab3": ("Lab3", "Container packing"),
+    "lab6": ("Lab6", "Game with nature"),
+    "lab7": ("Lab7", "Transport problem"),
+}
+
+
+def resolve(target):
+    lab, _, module = target.lower().partition(".")
+    if lab.isdigit():
+        lab = f"lab{lab}"
+    if lab not in LABS:
+        raise KeyError(target)
+    return f"{LABS[lab][0]}.{module or 'main'}"
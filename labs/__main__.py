@@ -0,0 +1,42 @@
+import os
+import runpy
+import sys
+
+from labs import LABS, ROOT, resolve
+
+
+def usage():
+    print("Usage: python -m labs <lab>[.<module>] [arguments...]")
+    print("       python -m labs serve [--port PORT] [--workers N]\n")
+    for name, (_, title) in LABS.items():
+        print(f"  {name:<6} {title}")
+    print("\nExamples: python -m labs lab3 data.npy, python -m labs 7 --sparse, "
+          "python -m labs lab7.benchmark_network_simplex 100x100")
+
+
+def main(argv):
+    if not argv or argv[0] in ("-h", "--help"):
+        usage()
+        return 0 if argv else 1
+
+    if argv[0] == "serve":
+        from labs.server import main as serve
+        return serve(argv[1:])
+
+    try:
+        module = resolve(argv[0])
+    except KeyError:
+        print(f"Unknown lab '{argv[0]}'\n")
+        usage()
+        return 1
+
+    # Labs read and write their tables next to their sources, so run them from there
+    arguments = [os.path.abspath(argument) if os.path.exists(argument) else argument for argument in argv[1:]]
+    os.chdir(os.path.join(ROOT, module.split(".")[0]))
+    sys.argv = [module] + arguments
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+import contextlib
+import io
+import signal
+
+import numpy as np
+
+PACKING_ALGORITHMS = ("nfa", "ffa", "wfa", "bfa")
+# Best fit re-sorts the containers for every item, so 1000 items already take a few seconds
+MAX_PACKING_ITEMS = 1000
+
+
+def warm_up():
+    # Ctrl+C is handled by the server, which shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import Lab1.main
+    import Lab2.main
+    import Lab3.main
+    import Lab6.criteria
+    import Lab7.transport
+    import scipy.optimize
+
+
+def ping():
+    return True
+
+
+def _matrix(payload, key):
+    matrix = np.asarray(payload[key], dtype=np.float64)
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError(f"'{key}' must be a non-empty 2D array")
+    return matrix
+
+
+def pareto(payload):
+    from Lab1.main import Alternative, mark_dominated
+
+    a_list = []
+    for i, values in enumerate(payload["alternatives"]):
+        if len(values) not in (2, 3):
+            raise ValueError("Every alternative needs two or three criteria")
+        a_list.append(Alternative(f"A{i + 1}", *values))
+    mark_dominated(a_list)
+
+    return {
+        "alternatives": [{"name": alt.name, "pareto": alt.pareto, "slater": alt.slater} for alt in a_list],
+        "pareto": [alt.name for alt in a_list if not alt.pareto],
+        "slater": [alt.name for alt in a_list if not alt.slater],
+    }
+
+
+def linear_program(payload):
+    from Lab2.main import LPData, OptimizationGoal, solve_lp
+
+    lp_data = LPData(
+        a_matrix=_matrix(payload, "a_matrix").tolist(),
+        b_vector=list(map(float, payload["b_vector"])),
+        f_vector=list(map(float, payload["f_vector"])),
+        signs=list(payload.get("signs") or ["<="] * len(payload["b_vector"])),
+        optimization_goal=OptimizationGoal(payload.get("goal", "min")),
+        x_count=len(payload["f_vector"]),
+    )
+    if any(sign not in ("<=", ">=", "=") for sign in lp_data.signs):
+        raise ValueError("signs must be '<=', '>=' or '='")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        solution = solve_lp(lp_data)
+    if solution is None:
+        return {"success": False}
+    x, value = solution
+    return {"success": True, "x": [float(v) for v in x], "value": float(value)}
+
+
+def packing(payload):
+    from Lab3.main import NPAlgorithm
+
+    weights = np.asarray(payload["weights"], dtype=np.int64)
+    if weights.ndim != 1 or weights.size == 0 or weights.min() <= 0 or weights.max() > 100:
+        raise ValueError("weights must be a non-empty list of integers from 1 to 100")
+    if weights.size > MAX_PACKING_ITEMS:
+        raise ValueError(f"At most {MAX_PACKING_ITEMS} weights can be packed per request")
+
+    algorithm = NPAlgorithm(weights[np.newaxis], 100)
+    result = algorithm.get_row_result(bool(payload.get("sort", False)), 0)
+    return {
+        "containers": {name: int(value) for name, value in zip(PACKING_ALGORITHMS, result[:4])},
+        "comparisons": {name: int(value) for name, value in zip(PACKING_ALGORITHMS, result[4:])},
+        "lower_bound": algorithm.min_containers_estimate(weights),
+    }
+
+
+def nature_batch(payoffs, pessimism=0.5, probabilities=None, confidence=0.5, ties="first"):
+    from Lab6.criteria import evaluate_batch
+
+    chosen = evaluate_batch(payoffs, pessimism, probabilities, confidence, ties)
+    if ties == "all":
+        return [{name: (np.flatnonzero(mask[k]) + 1).tolist() for name, mask in chosen.items()}
+                for k in range(len(payoffs))]
+    return [{name: int(strategies[k]) for name, strategies in chosen.items()} for k in range(len(payoffs))]
+
+
+def transport(payload):
+    from Lab7.transport import TransportProblem
+
+    problem = TransportProblem(payload["supply"], payload["demand"], _matrix(payload, "cost_matrix"))
+    allocation = problem.initial_plan(payload.get("method", "vogels_approximation"))
+    iterations = 0
+    if payload.get("optimize", True):
+        allocation, iterations = problem.optimize(allocation)
+    return {
+        "allocation": allocation[:problem.suppliers_count, :problem.consumers_count].tolist(),
+        "cost": problem.cost(allocation),
+        "iterations": iterations,
+    }
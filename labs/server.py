@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from labs import jobs
+
+ENDPOINTS = {
+    "/pareto": jobs.pareto,
+    "/lp": jobs.linear_program,
+    "/packing": jobs.packing,
+    "/transport": jobs.transport,
+}
+NATURE_OPTIONS = {"pessimism": 0.5, "probabilities": None, "confidence": 0.5, "ties": "first"}
+MAX_BODY = 64 * 1024 * 1024
+
+
+class BadRequest(Exception):
+    pass
+
+
+class Metrics:
+    def __init__(self, window=2048):
+        self.window = window
+        self.endpoints = {}
+
+    def endpoint(self, name):
+        if name not in self.endpoints:
+            self.endpoints[name] = {"requests": 0, "errors": 0, "rejected": 0, "batches": 0, "batched": 0,
+                                    "latency": deque(maxlen=self.window)}
+        return self.endpoints[name]
+
+    def record(self, name, seconds, status):
+        endpoint = self.endpoint(name)
+        endpoint["requests"] += 1
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            endpoint["rejected"] += 1
+        elif status >= 400:
+            endpoint["errors"] += 1
+        else:
+            endpoint["latency"].append(seconds)
+
+    def record_batch(self, name, size):
+        endpoint = self.endpoint(name)
+        endpoint["batches"] += 1
+        endpoint["batched"] += size
+
+    def snapshot(self):
+        result = {}
+        for name, endpoint in self.endpoints.items():
+            summary = {key: endpoint[key] for key in ("requests", "errors", "rejected")}
+            if endpoint["batches"]:
+                summary["batches"] = endpoint["batches"]
+                summary["mean_batch"] = endpoint["batched"] / endpoint["batches"]
+            if endpoint["latency"]:
+                p50, p90, p99 = np.percentile(endpoint["latency"], [50, 90, 99]) * 1e3
+                summary.update(p50_ms=p50, p90_ms=p90, p99_ms=p99, max_ms=max(endpoint["latency"]) * 1e3)
+            result[name] = summary
+        return result
+
+
+class MicroBatcher:
+    def __init__(self, run_batch, max_batch=64, max_delay=0.002):
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = {}
+        self.timers = {}
+        # The event loop only keeps weak references to tasks, so running batches are held here
+        self.tasks = set()
+
+    def submit(self, key, item):
+        future = asyncio.get_running_loop().create_future()
+        queue = self.pending.setdefault(key, [])
+        queue.append((item, future))
+        if len(queue) >= self.max_batch:
+            self.flush(key)
+        elif len(queue) == 1:
+            self.timers[key] = asyncio.get_running_loop().call_later(self.max_delay, self.flush, key)
+        return future
+
+    def flush(self, key):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self.pending.pop(key, None)
+        if queue:
+            task = asyncio.ensure_future(self._run(key, queue))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, key, queue):
+        try:
+            results = await self.run_batch(key, [item for item, _ in queue])
+        except Exception as e:
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class LabServer:
+    def __init__(self, workers=None, max_pending=256, max_batch=64, batch_delay=0.002, batch_cells=4096):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.batch_cells = batch_cells
+        self.pending = 0
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(self._nature_batch, max_batch, batch_delay)
+        self.executor = None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        # Forking a process that runs an event loop copies its state; fresh interpreters are safer
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=jobs.warm_up,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, jobs.ping) for _ in range(self.workers)])
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_connection, unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body is too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, path.split("?")[0], body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Malformed requests, dropped clients and shutdown all just end the connection
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        headers = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+                   f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def dispatch(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "workers": self.workers, "pending": self.pending}
+        if method == "GET" and path == "/metrics":
+            return HTTPStatus.OK, self.metrics.snapshot()
+        if path not in ENDPOINTS and path != "/nature":
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint '{path}'"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}
+
+        start = time.perf_counter()
+        if self.pending >= self.max_pending:
+            status, payload = HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Server is busy, retry later"}
+        else:
+            self.pending += 1
+            try:
+                status, payload = HTTPStatus.OK, await self.solve(path, json.loads(body or b"{}"))
+            except (BadRequest, ValueError, KeyError, TypeError) as e:
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": f"{type(e).__name__}: {e}"}
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                self.pending -= 1
+        self.metrics.record(path, time.perf_counter() - start, status)
+        return status, payload
+
+    async def solve(self, path, payload):
+        if not isinstance(payload, dict):
+            raise BadRequest("The request body must be a JSON object")
+        if path == "/nature":
+            return await self.nature(payload)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, ENDPOINTS[path], payload)
+
+    async def nature(self, payload):
+        matrix = np.asarray(payload["matrix"], dtype=np.float64)
+        if matrix.ndim != 2 or matrix.size == 0:
+            raise BadRequest("'matrix' must be a non-empty 2D array")
+        options = {name: payload.get(name, default) for name, default in NATURE_OPTIONS.items()}
+        if options["probabilities"] is not None:
+            options["probabilities"] = tuple(map(float, options["probabilities"]))
+
+        # Small matrices of the same shape and options are stacked into one vectorized call
+        key = (matrix.shape, *options.values())
+        if matrix.size > self.batch_cells:
+            return (await self._nature_batch(key, [matrix]))[0]
+        return await self.batcher.submit(key, matrix)
+
+    async def _nature_batch(self, key, matrices):
+        self.metrics.record_batch("/nature", len(matrices))
+        options = dict(zip(NATURE_OPTIONS, key[1:]))
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(jobs.nature_batch, np.stack(matrices), **options))
+
+
+async def serve(args):
+    server = LabServer(args.workers, args.max_pending, args.max_batch, args.batch_delay_ms / 1e3)
+    await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{server.server.sockets[0].getsockname()[1]}"
+    print(f"Serving the lab solvers on {where} with {server.workers} workers (Ctrl+C to stop)")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m labs serve", description="HTTP/JSON server for the lab solvers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="solver processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests in flight before answering 503")
+    parser.add_argument("--max-batch", type=int, default=64, help="largest /nature micro-batch")
+    parser.add_argument("--batch-delay-ms", type=float, default=2.0, help="how long a /nature batch waits to fill")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0